@@ -1,14 +1,22 @@
 import tkinter as tk
 from tkinter import messagebox, ttk
 from abc import ABC, abstractmethod
+from collections import Counter
 from datetime import datetime, timedelta
+import functools
+import os
 import sqlite3
 import logging
+import queue
+import threading
+from concurrent.futures import Future
 from pathlib import Path
 
-# Настройка логирования
+# Настройка логирования; уровень можно поднять, например LIBRARY_LOG_LEVEL=WARNING
+_log_level_name = (os.environ.get("LIBRARY_LOG_LEVEL") or "INFO").upper()
+_log_level = logging.getLevelName(_log_level_name)  # Для неизвестного имени - строка "Level ..."
 logging.basicConfig(
-    level=logging.INFO,
+    level=_log_level if isinstance(_log_level, int) else logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[
         logging.FileHandler('library.log'),
@@ -16,11 +24,15 @@ logging.basicConfig(
     ]
 )
 logger = logging.getLogger(__name__)
+if not isinstance(_log_level, int):
+    logger.warning("Неизвестный уровень логирования LIBRARY_LOG_LEVEL=%s, используется INFO", _log_level_name)
 
 # Абстрактный класс Person (наследование)
 class Person(ABC):
     """Абстрактный базовый класс для пользователей системы."""
     
+    __slots__ = ("_name", "_name_lower", "_id")  # Без __dict__ у каждого объекта
+    
     def __init__(self, name, person_id):
         """
         Инициализирует пользователя.
@@ -30,6 +42,7 @@ class Person(ABC):
             person_id (int): Уникальный ID пользователя
         """
         self._name = name  # Инкапсуляция
+        self._name_lower = name.lower()  # Ключ для поиска без учета регистра
         self._id = person_id
 
     def get_name(self):
@@ -43,6 +56,7 @@ class Person(ABC):
     def set_name(self, name):
         """Устанавливает новое имя пользователя."""
         self._name = name
+        self._name_lower = name.lower()
 
     @abstractmethod
     def borrow_book(self, book):
@@ -53,6 +67,7 @@ class Person(ABC):
 class User(Person):
     """Класс обычного пользователя библиотеки."""
     
+    __slots__ = ("_borrowed_books",)
     MAX_BOOKS = 3  # Максимум книг для пользователя
     
     def __init__(self, name, user_id):
@@ -63,7 +78,7 @@ class User(Person):
             user_id (int): Уникальный ID пользователя
         """
         super().__init__(name, user_id)
-        self._borrowed_books = []  # Инкапсуляция
+        self._borrowed_books = {}  # Инкапсуляция: ID книги -> Book
 
     def borrow_book(self, book):
         """Пользователь берет книгу (полиморфизм).
@@ -72,7 +87,7 @@ class User(Person):
             bool: True если успешно, False если достигнут лимит
         """
         if len(self._borrowed_books) < self.MAX_BOOKS: 
-            self._borrowed_books.append(book)
+            self._borrowed_books[book.get_id()] = book
             return True
         return False
 
@@ -82,14 +97,19 @@ class User(Person):
         Returns:
             bool: True если успешно, False если книги нет
         """
-        if book in self._borrowed_books:
-            self._borrowed_books.remove(book)
-            return True
-        return False
+        return self._borrowed_books.pop(book.get_id(), None) is not None
 
     def get_borrowed_books(self):
         """Возвращает список взятых книг."""
-        return self._borrowed_books
+        return list(self._borrowed_books.values())
+    
+    def has_borrowed(self, book):
+        """Проверяет, взята ли книга пользователем (поиск по ID без перебора списка).
+        
+        Returns:
+            bool: True если книга у пользователя
+        """
+        return book.get_id() in self._borrowed_books
     
     def get_borrowed_count(self):
         """Возвращает количество взятых книг."""
@@ -99,6 +119,7 @@ class User(Person):
 class Librarian(Person):
     """Класс библиотекаря с разными уровнями доступа."""
     
+    __slots__ = ("_access_level", "_borrowed_books")
     MAX_BOOKS_LIBRARIAN = 5  # Максимум книг для библиотекаря
     
     def __init__(self, name, librarian_id, access_level=1):
@@ -111,7 +132,7 @@ class Librarian(Person):
         """
         super().__init__(name, librarian_id)
         self._access_level = access_level  # Инкапсуляция
-        self._borrowed_books = []
+        self._borrowed_books = {}  # ID книги -> Book
 
     def get_access_level(self):
         """Возвращает уровень доступа."""
@@ -128,7 +149,7 @@ class Librarian(Person):
             bool: True если успешно
         """
         if len(self._borrowed_books) < self.MAX_BOOKS_LIBRARIAN:
-            self._borrowed_books.append(book)
+            self._borrowed_books[book.get_id()] = book
             return True
         return False
 
@@ -164,6 +185,11 @@ class Librarian(Person):
 class Author:
     """Класс для представления автора книги."""
     
+    # Длина биографии, показываемой в списке книг
+    SHORT_BIO_LENGTH = 30
+    
+    __slots__ = ("_id", "_name", "_name_lower", "_bio", "_short_bio")
+    
     def __init__(self, author_id, name, bio=""):
         """Инициализирует автора.
         
@@ -174,7 +200,8 @@ class Author:
         """
         self._id = author_id
         self._name = name
-        self._bio = bio
+        self._name_lower = name.lower()  # Ключ для поиска без учета регистра
+        self.set_bio(bio)
 
     def get_id(self):
         """Возвращает ID автора."""
@@ -188,13 +215,24 @@ class Author:
         """Возвращает биографию автора."""
         return self._bio
     
+    def get_short_bio(self):
+        """Возвращает биографию, обрезанную для показа в таблице."""
+        return self._short_bio
+    
     def set_bio(self, bio):
         """Устанавливает биографию автора."""
         self._bio = bio
+        # Автор общий для многих книг, поэтому обрезаем биографию один раз
+        if bio and len(bio) > self.SHORT_BIO_LENGTH:
+            self._short_bio = bio[:self.SHORT_BIO_LENGTH] + "..."
+        else:
+            self._short_bio = bio
 
 class Book:
     """Класс для представления книги."""
     
+    __slots__ = ("_id", "_title", "_title_lower", "_author", "_year", "_status")
+    
     def __init__(self, book_id, title, author, year, status="доступна"):
         """Инициализирует книгу.
         
@@ -207,10 +245,21 @@ class Book:
         """
         self._id = book_id
         self._title = title
+        self._title_lower = title.lower()  # Ключ для поиска без учета регистра
         self._author = author  # Композиция
         self._year = year
         self._status = status  # Инкапсуляция
 
+    def __eq__(self, other):
+        """Книги равны, если у них один ID в БД."""
+        if not isinstance(other, Book):
+            return NotImplemented
+        return self._id == other._id
+
+    def __hash__(self):
+        """Хэш по ID, согласованный с __eq__."""
+        return hash(self._id)
+
     def get_id(self):
         """Возвращает ID книги."""
         return self._id
@@ -222,6 +271,7 @@ class Book:
     def set_title(self, title):
         """Устанавливает название книги."""
         self._title = title
+        self._title_lower = title.lower()
 
     def get_author(self):
         """Возвращает автора книги."""
@@ -254,7 +304,11 @@ class Book:
 class Loan:
     """Класс для представления выдачи/возврата книги."""
     
+    __slots__ = ("_id", "_book", "_user", "_issue_date", "_return_date", "_due_date",
+                 "_issue_date_str", "_due_date_str")
     LOAN_DAYS = 14  # Срок выдачи книги
+    LOAN_PERIOD = timedelta(days=LOAN_DAYS)
+    DATE_FORMAT = "%d.%m.%Y"  # Формат дат для показа в GUI
     
     def __init__(self, loan_id, book, user, issue_date, return_date=None):
         """Инициализирует выдачу.
@@ -271,6 +325,10 @@ class Loan:
         self._user = user
         self._issue_date = issue_date
         self._return_date = return_date  # Инкапсуляция
+        self._due_date = issue_date + self.LOAN_PERIOD
+        # Даты выдачи не меняются, поэтому строки форматируются один раз при первом показе
+        self._issue_date_str = None
+        self._due_date_str = None
 
     def get_id(self):
         """Возвращает ID выдачи."""
@@ -280,16 +338,33 @@ class Loan:
         """Регистрирует возврат книги."""
         self._return_date = return_date
 
-    def is_overdue(self):
+    def is_overdue(self, now=None):
         """Проверяет, просрочена ли книга.
         
+        Args:
+            now (datetime): Текущее время; при проверке многих выдач
+                передается один раз вычисленное значение
+        
         Returns:
             bool: True если книга просрочена
         """
-        if self._return_date is None:
-            due_date = self._issue_date + timedelta(days=self.LOAN_DAYS)
-            return datetime.now() > due_date
-        return False
+        return self._return_date is None and (now or datetime.now()) > self._due_date
+    
+    def get_due_date(self):
+        """Возвращает срок возврата."""
+        return self._due_date
+    
+    def get_issue_date_str(self):
+        """Возвращает дату выдачи, отформатированную по DATE_FORMAT."""
+        if self._issue_date_str is None:
+            self._issue_date_str = self._issue_date.strftime(self.DATE_FORMAT)
+        return self._issue_date_str
+    
+    def get_due_date_str(self):
+        """Возвращает срок возврата, отформатированный по DATE_FORMAT."""
+        if self._due_date_str is None:
+            self._due_date_str = self._due_date.strftime(self.DATE_FORMAT)
+        return self._due_date_str
 
     def get_details(self):
         """Возвращает подробную информацию о выдаче."""
@@ -312,63 +387,156 @@ class Loan:
         """Возвращает дату возврата."""
         return self._return_date
 
+def _on_db_thread(method):
+    """Декоратор метода LibrarySystem, работающего с БД.
+    
+    Соединение и его курсор используются только фоновым потоком БД: вызов
+    из другого потока ставится в очередь и ждет результата. До запуска потока
+    (инициализация) и после его остановки метод выполняется напрямую.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        worker = getattr(self, "_worker", None)
+        if worker is None or not worker.is_alive() or threading.current_thread() is worker:
+            return method(self, *args, **kwargs)
+        return self.submit(method, self, *args, **kwargs).result()
+    return wrapper
+
 # Класс LibrarySystem с БД
 class LibrarySystem:
     """Главный класс системы управления библиотекой."""
     
-    def __init__(self, db_name="library.db"):
-        """Инициализирует систему и подключается к БД."""
+    # Повторяющиеся SQL-запросы: одинаковый текст позволяет sqlite3
+    # брать уже подготовленное выражение из кэша соединения
+    _SQL_GET_AUTHOR = "SELECT id, name, bio FROM authors WHERE id=?"
+    _SQL_GET_BOOK = "SELECT id, title, author_id, year, status FROM books WHERE id=?"
+    _SQL_GET_USER = "SELECT id, name FROM users WHERE id=?"
+    _SQL_GET_LIBRARIAN = "SELECT id, name, access_level FROM librarians WHERE id=?"
+    _SQL_INSERT_AUTHOR = "INSERT INTO authors (name, bio) VALUES (?, ?)"
+    _SQL_INSERT_BOOK = "INSERT INTO books (title, author_id, year, status) VALUES (?, ?, ?, ?)"
+    _SQL_INSERT_USER = "INSERT INTO users (name) VALUES (?)"
+    _SQL_SET_BOOK_STATUS = "UPDATE books SET status=? WHERE id=?"
+    
+    # INSERT ... RETURNING id поддерживается начиная с SQLite 3.35
+    _HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+    
+    # Таблицы и колонки с полнотекстовым поиском (FTS5)
+    _FTS_TABLES = (("books", "title"), ("authors", "name"), ("users", "name"))
+    _FTS_MIN_QUERY = 3  # trigram не находит запросы короче 3 символов
+    
+    def __init__(self, db_name="library.db", seed=True, template=None):
+        """Инициализирует систему и подключается к БД.
+        
+        Args:
+            db_name (str): Путь к файлу БД (":memory:" - БД в памяти)
+            seed (bool): Добавить демо-данные, если книг в БД нет
+            template (sqlite3.Connection): БД с готовой схемой; ее содержимое копируется
+                через backup() вместо создания таблиц и индексов (используется в тестах)
+        """
         self._db_name = db_name
         try:
-            self._conn = sqlite3.connect(db_name)
+            # Соединением пользуется фоновый поток БД, поэтому проверка потока отключена
+            self._conn = sqlite3.connect(db_name, check_same_thread=False)
             self._conn.row_factory = sqlite3.Row
-            self._create_tables()
+            self._cur = self._conn.cursor()  # Один курсор на все запросы, после запуска - только из фонового потока
+            if template is not None:
+                template.backup(self._conn)
+            self._configure_connection()
+            if template is not None:
+                self._cur.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='books_fts'")
+                self._fts_enabled = self._cur.fetchone() is not None
+            else:
+                self._create_tables()
+                self._fts_enabled = self._create_search_index()
+            # Порядок важен: книги ссылаются на авторов, выдачи - на книги и пользователей
+            self._authors = self._load_authors()
+            self._authors_by_id = {a.get_id(): a for a in self._authors}
             self._books = self._load_books()
+            self._books_by_id = {b.get_id(): b for b in self._books}
+            # ID доступных книг поддерживаются при выдаче/возврате, статус книг заново не проверяется
+            self._available_books = {b.get_id(): b for b in self._books if b.is_available()}
             self._users = self._load_users()
-            self._librarians = self._load_librarians()
-            self._loans = self._load_loans()
-            self._authors = self._load_authors()
+            self._users_by_id = {u.get_id(): u for u in self._users}
+            # Выдачи и библиотекари загружаются при первом обращении
+            self._librarians = None
+            self._librarians_by_id = None
+            self._loans = None
+            self._loans_by_id = None
+            self._active_loans = None
+            # Номер версии данных: растет при каждом изменении книг, пользователей и выдач
+            self._version = 0
             logger.info("Система инициализирована успешно")
 
-            if not self._books:
+            if seed and not self._books:
                 self._init_demo_data()
+            
+            # Фоновый поток для операций, которые GUI не должен ждать
+            self._tasks = queue.Queue()
+            self._worker = threading.Thread(target=self._run_worker, name="library-db", daemon=True)
+            self._worker.start()
         except sqlite3.Error as e:
-            logger.error(f"Ошибка подключения к БД: {e}")
+            logger.error("Ошибка подключения к БД: %s", e)
             raise
 
+    def _configure_connection(self):
+        """Настраивает SQLite: WAL-журнал и ослабленный fsync для быстрых commit()."""
+        self._conn.executescript("""PRAGMA journal_mode=WAL;
+                                    PRAGMA synchronous=NORMAL;
+                                    PRAGMA temp_store=MEMORY;
+                                    PRAGMA cache_size=-20000;""")
+        journal_mode = self._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        logger.info("Режим журнала БД: %s", journal_mode)
+
     def _init_demo_data(self):
-        """Инициализирует демо-данные."""
+        """Инициализирует демо-данные одной транзакцией."""
+        authors_data = [("Лев Толстой", "Великий русский писатель"),
+                        ("Фёдор Достоевский", "Классик русской литературы")]
+        books_data = [("Война и мир", "Лев Толстой", 1869),
+                      ("Преступление и наказание", "Фёдор Достоевский", 1866)]
+        users_data = [("Иван Иванов",), ("Мария Петрова",)]
         try:
-            cursor = self._conn.cursor()
-            cursor.execute("INSERT INTO authors (name, bio) VALUES (?, ?)", 
-                         ("Лев Толстой", "Великий русский писатель"))
-            author1_id = cursor.lastrowid
-            
-            cursor.execute("INSERT INTO authors (name, bio) VALUES (?, ?)", 
-                         ("Фёдор Достоевский", "Классик русской литературы"))
-            author2_id = cursor.lastrowid
-            
-            cursor.execute("INSERT INTO books (title, author_id, year, status) VALUES (?, ?, ?, ?)", 
-                         ("Война и мир", author1_id, 1869, "доступна"))
-            cursor.execute("INSERT INTO books (title, author_id, year, status) VALUES (?, ?, ?, ?)", 
-                         ("Преступление и наказание", author2_id, 1866, "доступна"))
-            
-            cursor.execute("INSERT INTO users (name) VALUES (?)", ("Иван Иванов",))
-            cursor.execute("INSERT INTO users (name) VALUES (?)", ("Мария Петрова",))
+            cursor = self._cur
+            with self._conn:
+                cursor.executemany(self._SQL_INSERT_AUTHOR, authors_data)
+                cursor.execute("SELECT id, name, bio FROM authors WHERE name IN (?, ?)",
+                               [name for name, _ in authors_data])
+                authors = {name: Author(author_id, name, bio) for author_id, name, bio in cursor.fetchall()}
+                
+                cursor.executemany(self._SQL_INSERT_BOOK,
+                                   [(title, authors[author_name].get_id(), year, "доступна")
+                                    for title, author_name, year in books_data])
+                # AUTOINCREMENT выдает возрастающие ID, поэтому новые строки - последние по id
+                cursor.execute("SELECT id, title, author_id, year, status FROM books ORDER BY id DESC LIMIT ?",
+                               (len(books_data),))
+                book_rows = cursor.fetchall()[::-1]
+                
+                cursor.executemany(self._SQL_INSERT_USER, users_data)
+                cursor.execute("SELECT id, name FROM users ORDER BY id DESC LIMIT ?", (len(users_data),))
+                user_rows = cursor.fetchall()[::-1]
             
-            self._conn.commit()
-            self._books = self._load_books()
-            self._users = self._load_users()
-            self._authors = self._load_authors()
+            # Добавляем объекты в память без перезагрузки таблиц
+            authors_by_id = {a.get_id(): a for a in authors.values()}
+            for author in authors.values():
+                self._authors.append(author)
+                self._authors_by_id[author.get_id()] = author
+            for book_id, title, author_id, year, status in book_rows:
+                book = Book(book_id, title, authors_by_id[author_id], year, status)
+                self._books.append(book)
+                self._books_by_id[book_id] = book
+                if book.is_available():
+                    self._available_books[book_id] = book
+            for user_id, name in user_rows:
+                user = User(name, user_id)
+                self._users.append(user)
+                self._users_by_id[user_id] = user
             logger.info("Демо-данные добавлены")
         except sqlite3.Error as e:
-            logger.error(f"Ошибка при добавлении демо-данных: {e}")
-            self._conn.rollback()
+            logger.error("Ошибка при добавлении демо-данных: %s", e)
 
     def _create_tables(self):
         """Создает таблицы БД с улучшениями (UNIQUE, CHECK, индексы)."""
         try:
-            cursor = self._conn.cursor()
+            cursor = self._cur
             
             # Таблица авторов с UNIQUE на name
             cursor.execute('''CREATE TABLE IF NOT EXISTS authors (
@@ -403,137 +571,317 @@ class LibrarySystem:
                                 access_level INTEGER CHECK(access_level > 0)
                               )''')
             
-            # Таблица выдач с индексами
+            # Таблица выдач с индексами; даты хранятся как unix time (секунды)
             cursor.execute('''CREATE TABLE IF NOT EXISTS loans (
                                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                                 book_id INTEGER,
                                 user_id INTEGER,
-                                issue_date TEXT,
-                                return_date TEXT,
+                                issue_ts INTEGER,
+                                return_ts INTEGER,
                                 FOREIGN KEY (book_id) REFERENCES books(id),
                                 FOREIGN KEY (user_id) REFERENCES users(id)
                               )''')
+            self._migrate_loan_dates()
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_loans_user_id ON loans(user_id)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_loans_book_id ON loans(book_id)')
+            # Частичный индекс только по активным выдачам (для поиска просрочек)
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_loans_active ON loans(issue_ts) WHERE return_ts IS NULL')
             
             self._conn.commit()
             logger.info("Таблицы БД созданы/проверены")
         except sqlite3.Error as e:
-            logger.error(f"Ошибка при создании таблиц: {e}")
+            logger.error("Ошибка при создании таблиц: %s", e)
             raise
 
+    def _migrate_loan_dates(self):
+        """Переводит даты выдач старой БД из ISO-строк в unix time.
+        
+        Старые колонки issue_date/return_date остаются, но больше не используются.
+        Перевод выполняется в Python, чтобы сохранить локальное время
+        (strftime('%s') в SQLite считает дату UTC).
+        """
+        cursor = self._cur
+        cursor.execute("PRAGMA table_info(loans)")
+        columns = {row[1] for row in cursor.fetchall()}
+        if "issue_ts" in columns:
+            return
+        
+        def to_ts(value):
+            return int(datetime.fromisoformat(value).timestamp()) if value else None
+        
+        cursor.execute("ALTER TABLE loans ADD COLUMN issue_ts INTEGER")
+        cursor.execute("ALTER TABLE loans ADD COLUMN return_ts INTEGER")
+        cursor.execute("SELECT id, issue_date, return_date FROM loans")
+        rows = [(to_ts(issue_date), to_ts(return_date), loan_id)
+                for loan_id, issue_date, return_date in cursor.fetchall()]
+        cursor.executemany("UPDATE loans SET issue_ts=?, return_ts=? WHERE id=?", rows)
+        logger.info("Даты выдач переведены в unix time: %s", len(rows))
+
+    def _create_search_index(self):
+        """Создает полнотекстовые FTS5-индексы для поиска по подстроке.
+        
+        Токенизатор trigram ищет по любой подстроке без учета регистра.
+        Индексы синхронизируются с основными таблицами триггерами.
+        
+        Returns:
+            bool: True если FTS5 доступен и индексы созданы
+        """
+        try:
+            cursor = self._cur
+            for table, column in self._FTS_TABLES:
+                fts = f"{table}_fts"
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (fts,))
+                is_new = cursor.fetchone() is None
+                
+                cursor.execute(f"""CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                                    {column}, content='{table}', content_rowid='id', tokenize='trigram'
+                                  )""")
+                cursor.execute(f"""CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+                                    INSERT INTO {fts}(rowid, {column}) VALUES (new.id, new.{column});
+                                  END""")
+                cursor.execute(f"""CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+                                    INSERT INTO {fts}({fts}, rowid, {column}) VALUES ('delete', old.id, old.{column});
+                                  END""")
+                cursor.execute(f"""CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {column} ON {table} BEGIN
+                                    INSERT INTO {fts}({fts}, rowid, {column}) VALUES ('delete', old.id, old.{column});
+                                    INSERT INTO {fts}(rowid, {column}) VALUES (new.id, new.{column});
+                                  END""")
+                
+                # Индекс для уже существующей БД заполняем один раз
+                if is_new:
+                    cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+            
+            self._conn.commit()
+            return True
+        except sqlite3.OperationalError as e:
+            logger.warning("FTS5 недоступен, поиск будет выполняться в памяти: %s", e)
+            self._conn.rollback()
+            return False
+
     def _load_authors(self):
         """Загружает авторов из БД."""
         try:
-            cursor = self._conn.cursor()
+            cursor = self._cur
             cursor.execute("SELECT id, name, bio FROM authors")
             return [Author(id, name, bio) for id, name, bio in cursor.fetchall()]
         except sqlite3.Error as e:
-            logger.error(f"Ошибка загрузки авторов: {e}")
+            logger.error("Ошибка загрузки авторов: %s", e)
             return []
 
     def _load_books(self):
-        """Загружает книги из БД."""
+        """Загружает книги из БД.
+        
+        Авторы берутся из уже загруженного self._authors_by_id,
+        поэтому каталог читается одним запросом без обращения к БД на каждую книгу.
+        """
         try:
-            cursor = self._conn.cursor()
+            cursor = self._cur
             cursor.execute("SELECT id, title, author_id, year, status FROM books")
             books = []
             for book_id, title, author_id, year, status in cursor.fetchall():
-                author = self._get_author_by_id(author_id)
+                author = self._authors_by_id.get(author_id)
                 if author:
                     books.append(Book(book_id, title, author, year, status))
             return books
         except sqlite3.Error as e:
-            logger.error(f"Ошибка загрузки книг: {e}")
+            logger.error("Ошибка загрузки книг: %s", e)
             return []
 
     def _load_users(self):
         """Загружает пользователей из БД."""
         try:
-            cursor = self._conn.cursor()
+            cursor = self._cur
             cursor.execute("SELECT id, name FROM users")
             return [User(name, id) for id, name in cursor.fetchall()]
         except sqlite3.Error as e:
-            logger.error(f"Ошибка загрузки пользователей: {e}")
+            logger.error("Ошибка загрузки пользователей: %s", e)
             return []
 
     def _load_librarians(self):
         """Загружает библиотекарей из БД."""
         try:
-            cursor = self._conn.cursor()
+            cursor = self._cur
             cursor.execute("SELECT id, name, access_level FROM librarians")
             return [Librarian(name, id, access_level) for id, name, access_level in cursor.fetchall()]
         except sqlite3.Error as e:
-            logger.error(f"Ошибка загрузки библиотекарей: {e}")
+            logger.error("Ошибка загрузки библиотекарей: %s", e)
             return []
 
     def _load_loans(self):
-        """Загружает выдачи из БД."""
+        """Загружает выдачи из БД.
+        
+        Книги и пользователи берутся из self._books_by_id и self._users_by_id.
+        """
         try:
-            cursor = self._conn.cursor()
-            cursor.execute("SELECT id, book_id, user_id, issue_date, return_date FROM loans")
+            cursor = self._cur
+            cursor.execute("SELECT id, book_id, user_id, issue_ts, return_ts FROM loans")
             loans = []
-            for loan_id, book_id, user_id, issue_date_str, return_date_str in cursor.fetchall():
-                book = self._get_book_by_id(book_id)
-                user = self._get_user_by_id(user_id)
+            for loan_id, book_id, user_id, issue_ts, return_ts in cursor.fetchall():
+                book = self._books_by_id.get(book_id)
+                user = self._users_by_id.get(user_id)
                 if book and user:
-                    issue_date = datetime.fromisoformat(issue_date_str)
-                    return_date = datetime.fromisoformat(return_date_str) if return_date_str else None
+                    issue_date = datetime.fromtimestamp(issue_ts)
+                    return_date = datetime.fromtimestamp(return_ts) if return_ts is not None else None
                     loan = Loan(loan_id, book, user, issue_date, return_date)
                     loans.append(loan)
             return loans
         except sqlite3.Error as e:
-            logger.error(f"Ошибка загрузки выдач: {e}")
+            logger.error("Ошибка загрузки выдач: %s", e)
             return []
 
+    @_on_db_thread
     def _get_author_by_id(self, author_id):
-        """Получает автора по ID."""
+        """Получает автора по ID.
+        
+        Сначала ищет в уже загруженных объектах, к БД обращается только при промахе.
+        """
+        author = self._authors_by_id.get(author_id)
+        if author:
+            return author
         try:
-            cursor = self._conn.cursor()
-            cursor.execute("SELECT id, name, bio FROM authors WHERE id=?", (author_id,))
+            cursor = self._cur
+            cursor.execute(self._SQL_GET_AUTHOR, (author_id,))
             row = cursor.fetchone()
-            return Author(row[0], row[1], row[2]) if row else None
+            if row:
+                author = Author(row[0], row[1], row[2])
+                self._authors.append(author)
+                self._authors_by_id[author.get_id()] = author
+            return author
         except sqlite3.Error as e:
-            logger.error(f"Ошибка получения автора: {e}")
+            logger.error("Ошибка получения автора: %s", e)
             return None
 
+    @_on_db_thread
     def _get_book_by_id(self, book_id):
-        """Получает книгу по ID."""
+        """Получает книгу по ID (сначала из памяти, затем из БД)."""
+        book = self._books_by_id.get(book_id)
+        if book:
+            return book
         try:
-            cursor = self._conn.cursor()
-            cursor.execute("SELECT id, title, author_id, year, status FROM books WHERE id=?", (book_id,))
+            cursor = self._cur
+            cursor.execute(self._SQL_GET_BOOK, (book_id,))
             row = cursor.fetchone()
             if row:
                 author = self._get_author_by_id(row[2])
-                return Book(row[0], row[1], author, row[3], row[4]) if author else None
-            return None
+                if author:
+                    book = Book(row[0], row[1], author, row[3], row[4])
+                    self._books.append(book)
+                    self._books_by_id[book.get_id()] = book
+                    if book.is_available():
+                        self._available_books[book.get_id()] = book
+            return book
         except sqlite3.Error as e:
-            logger.error(f"Ошибка получения книги: {e}")
+            logger.error("Ошибка получения книги: %s", e)
             return None
 
+    @_on_db_thread
     def _get_user_by_id(self, user_id):
-        """Получает пользователя по ID."""
+        """Получает пользователя по ID (сначала из памяти, затем из БД)."""
+        user = self._users_by_id.get(user_id)
+        if user:
+            return user
         try:
-            cursor = self._conn.cursor()
-            cursor.execute("SELECT id, name FROM users WHERE id=?", (user_id,))
+            cursor = self._cur
+            cursor.execute(self._SQL_GET_USER, (user_id,))
             row = cursor.fetchone()
-            return User(row[1], row[0]) if row else None
+            if row:
+                user = User(row[1], row[0])
+                self._users.append(user)
+                self._users_by_id[user.get_id()] = user
+            return user
         except sqlite3.Error as e:
-            logger.error(f"Ошибка получения пользователя: {e}")
+            logger.error("Ошибка получения пользователя: %s", e)
             return None
 
-    def find_book_by_title(self, title):
-        """Ищет книги по подстроке названия."""
-        return [b for b in self._books if title.lower() in b.get_title().lower()]
+    def _insert(self, sql, params):
+        """Выполняет INSERT и возвращает ID новой строки.
+        
+        На SQLite >= 3.35 ID возвращается тем же запросом (RETURNING id),
+        иначе берется из cursor.lastrowid.
+        """
+        cursor = self._cur
+        if self._HAS_RETURNING:
+            # fetchall() доводит выражение до конца, чтобы commit() не ждал его
+            cursor.execute(sql + " RETURNING id", params)
+            return cursor.fetchall()[0][0]
+        cursor.execute(sql, params)
+        return cursor.lastrowid
+
+    def _search_ids(self, table, text, limit=None):
+        """Ищет ID записей по подстроке через FTS5-индекс таблицы.
+        
+        Args:
+            table (str): Имя основной таблицы (books, authors, users)
+            text (str): Искомая подстрока
+            limit (int): Максимальное число результатов (None - без ограничения)
+            
+        Returns:
+            list: ID найденных записей или None, если нужен поиск в памяти
+        """
+        if not self._fts_enabled or len(text) < self._FTS_MIN_QUERY:
+            return None
+        try:
+            cursor = self._cur
+            # Запрос в кавычках - фраза, спецсимволы FTS5 не интерпретируются
+            phrase = '"' + text.replace('"', '""') + '"'
+            # LIMIT -1 в SQLite означает отсутствие ограничения
+            cursor.execute(f"SELECT rowid FROM {table}_fts WHERE {table}_fts MATCH ? ORDER BY rowid LIMIT ?",
+                           (phrase, -1 if limit is None else limit))
+            return [row[0] for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            logger.error("Ошибка полнотекстового поиска: %s", e)
+            return None
+
+    @_on_db_thread
+    def find_book_by_title(self, title, limit=None):
+        """Ищет книги по подстроке названия.
+        
+        Args:
+            title (str): Искомая подстрока
+            limit (int): Максимальное число результатов (None - все)
+            
+        Returns:
+            list: Найденные книги в порядке ID
+        """
+        ids = self._search_ids("books", title, limit)
+        if ids is None:
+            query = title.lower()
+            return [b for b in self._books if query in b._title_lower][:limit]
+        return [self._books_by_id[i] for i in ids if i in self._books_by_id]
     
+    @_on_db_thread
     def find_user_by_name(self, name):
         """Ищет пользователей по подстроке имени."""
-        return [u for u in self._users if name.lower() in u.get_name().lower()]
+        ids = self._search_ids("users", name)
+        if ids is None:
+            query = name.lower()
+            return [u for u in self._users if query in u._name_lower]
+        return [self._users_by_id[i] for i in ids if i in self._users_by_id]
     
+    @_on_db_thread
     def find_author_by_name(self, name):
         """Ищет авторов по подстроке имени."""
-        return [a for a in self._authors if name.lower() in a.get_name().lower()]
-
+        ids = self._search_ids("authors", name)
+        if ids is None:
+            query = name.lower()
+            return [a for a in self._authors if query in a._name_lower]
+        return [self._authors_by_id[i] for i in ids if i in self._authors_by_id]
+
+    def find_book_by_id(self, book_id):
+        """Возвращает книгу по ID из памяти (O(1)), при промахе - из БД, или None."""
+        book = self._books_by_id.get(book_id)
+        if book is None:
+            book = self._get_book_by_id(book_id)  # Запрос к БД идет в фоновом потоке
+        return book
+    
+    def find_user_by_id(self, user_id):
+        """Возвращает пользователя по ID из памяти (O(1)), при промахе - из БД, или None."""
+        user = self._users_by_id.get(user_id)
+        if user is None:
+            user = self._get_user_by_id(user_id)  # Запрос к БД идет в фоновом потоке
+        return user
+
+    @_on_db_thread
     def add_book(self, title, author_name, author_bio, year):
         """Добавляет книгу в систему.
         
@@ -547,38 +895,44 @@ class LibrarySystem:
             bool: True если успешно добавлена
         """
         try:
-            cursor = self._conn.cursor()
+            cursor = self._cur
             
             # Проверяем/добавляем автора
-            cursor.execute("SELECT id FROM authors WHERE name=?", (author_name,))
+            cursor.execute("SELECT id, bio FROM authors WHERE name=?", (author_name,))
             author_row = cursor.fetchone()
             
             if author_row:
                 author_id = author_row[0]
+                author = self._authors_by_id.get(author_id) or Author(author_id, author_name, author_row[1])
             else:
-                cursor.execute("INSERT INTO authors (name, bio) VALUES (?, ?)", 
-                             (author_name, author_bio))
-                author_id = cursor.lastrowid
+                author_id = self._insert(self._SQL_INSERT_AUTHOR, (author_name, author_bio))
+                author = Author(author_id, author_name, author_bio)
             
             # Добавляем книгу
-            cursor.execute("INSERT INTO books (title, author_id, year, status) VALUES (?, ?, ?, ?)", 
-                         (title, author_id, year, "доступна"))
+            book_id = self._insert(self._SQL_INSERT_BOOK, (title, author_id, year, "доступна"))
             self._conn.commit()
             
-            # Перезагружаем данные
-            self._books = self._load_books()
-            self._authors = self._load_authors()
-            logger.info(f"Книга '{title}' добавлена")
+            # Обновляем данные в памяти без перезагрузки из БД
+            if author_id not in self._authors_by_id:
+                self._authors.append(author)
+                self._authors_by_id[author_id] = author
+            book = Book(book_id, title, author, year, "доступна")
+            self._books.append(book)
+            self._books_by_id[book_id] = book
+            self._available_books[book_id] = book
+            self._version += 1
+            logger.info("Книга '%s' добавлена", title)
             return True
         except sqlite3.IntegrityError as e:
-            logger.warning(f"Ошибка целостности при добавлении книги: {e}")
+            logger.warning("Ошибка целостности при добавлении книги: %s", e)
             self._conn.rollback()
             return False
         except sqlite3.Error as e:
-            logger.error(f"Ошибка добавления книги: {e}")
+            logger.error("Ошибка добавления книги: %s", e)
             self._conn.rollback()
             return False
 
+    @_on_db_thread
     def remove_book(self, book_id):
         """Удаляет книгу из системы по ID.
         
@@ -586,17 +940,21 @@ class LibrarySystem:
             bool: True если успешно удалена
         """
         try:
-            cursor = self._conn.cursor()
+            cursor = self._cur
             cursor.execute("DELETE FROM books WHERE id=?", (book_id,))
             self._conn.commit()
-            self._books = self._load_books()
-            logger.info(f"Книга с ID {book_id} удалена")
+            if self._books_by_id.pop(book_id, None):
+                self._books = [b for b in self._books if b.get_id() != book_id]
+                self._available_books.pop(book_id, None)
+            self._version += 1
+            logger.info("Книга с ID %s удалена", book_id)
             return True
         except sqlite3.Error as e:
-            logger.error(f"Ошибка удаления книги: {e}")
+            logger.error("Ошибка удаления книги: %s", e)
             self._conn.rollback()
             return False
 
+    @_on_db_thread
     def edit_book(self, book_id, title=None, year=None, author_bio=None):
         """Редактирует данные книги.
         
@@ -604,7 +962,7 @@ class LibrarySystem:
             bool: True если успешно отредактирована
         """
         try:
-            cursor = self._conn.cursor()
+            cursor = self._cur
             
             if title is not None:
                 cursor.execute("UPDATE books SET title=? WHERE id=?", (title, book_id))
@@ -621,14 +979,25 @@ class LibrarySystem:
                              (author_bio, book_id))
             
             self._conn.commit()
-            self._books = self._load_books()
-            logger.info(f"Книга с ID {book_id} отредактирована")
+            
+            # Обновляем объекты в памяти
+            book = self._books_by_id.get(book_id)
+            if book:
+                if title is not None:
+                    book.set_title(title)
+                if year is not None:
+                    book.set_year(year)
+                if author_bio is not None:
+                    book.get_author().set_bio(author_bio)
+            self._version += 1
+            logger.info("Книга с ID %s отредактирована", book_id)
             return True
         except sqlite3.Error as e:
-            logger.error(f"Ошибка редактирования книги: {e}")
+            logger.error("Ошибка редактирования книги: %s", e)
             self._conn.rollback()
             return False
 
+    @_on_db_thread
     def register_user(self, name):
         """Регистрирует нового пользователя.
         
@@ -636,19 +1005,20 @@ class LibrarySystem:
             User: Новый пользователь или None при ошибке
         """
         try:
-            cursor = self._conn.cursor()
-            cursor.execute("INSERT INTO users (name) VALUES (?)", (name,))
+            user_id = self._insert(self._SQL_INSERT_USER, (name,))
             self._conn.commit()
-            user_id = cursor.lastrowid
             user = User(name, user_id)
             self._users.append(user)
-            logger.info(f"Пользователь '{name}' зарегистрирован")
+            self._users_by_id[user_id] = user
+            self._version += 1
+            logger.info("Пользователь '%s' зарегистрирован", name)
             return user
         except sqlite3.Error as e:
-            logger.error(f"Ошибка регистрации пользователя: {e}")
+            logger.error("Ошибка регистрации пользователя: %s", e)
             self._conn.rollback()
             return None
 
+    @_on_db_thread
     def edit_user(self, user_id, name):
         """Редактирует данные пользователя.
         
@@ -656,21 +1026,23 @@ class LibrarySystem:
             bool: True если успешно отредактирован
         """
         try:
-            cursor = self._conn.cursor()
+            cursor = self._cur
             cursor.execute("UPDATE users SET name=? WHERE id=?", (name, user_id))
             self._conn.commit()
             
             # Обновляем объект в памяти
-            user = next((u for u in self._users if u.get_id() == user_id), None)
+            user = self._users_by_id.get(user_id)
             if user:
                 user.set_name(name)
-            logger.info(f"Пользователь с ID {user_id} отредактирован")
+            self._version += 1
+            logger.info("Пользователь с ID %s отредактирован", user_id)
             return True
         except sqlite3.Error as e:
-            logger.error(f"Ошибка редактирования пользователя: {e}")
+            logger.error("Ошибка редактирования пользователя: %s", e)
             self._conn.rollback()
             return False
 
+    @_on_db_thread
     def delete_user(self, user_id):
         """Удаляет пользователя.
         
@@ -678,30 +1050,42 @@ class LibrarySystem:
             bool: True если успешно удален
         """
         try:
-            cursor = self._conn.cursor()
+            cursor = self._cur
             cursor.execute("DELETE FROM users WHERE id=?", (user_id,))
             self._conn.commit()
             self._users = [u for u in self._users if u.get_id() != user_id]
-            logger.info(f"Пользователь с ID {user_id} удален")
+            self._users_by_id.pop(user_id, None)
+            self._version += 1
+            logger.info("Пользователь с ID %s удален", user_id)
             return True
         except sqlite3.Error as e:
-            logger.error(f"Ошибка удаления пользователя: {e}")
+            logger.error("Ошибка удаления пользователя: %s", e)
             self._conn.rollback()
             return False
 
+    @_on_db_thread
     def register_librarian(self, librarian):
-        """Регистрирует библиотекаря."""
+        """Регистрирует библиотекаря; для существующего ID обновляет имя и уровень доступа."""
         try:
-            cursor = self._conn.cursor()
-            cursor.execute("INSERT OR IGNORE INTO librarians (id, name, access_level) VALUES (?, ?, ?)", 
-                         (librarian.get_id(), librarian.get_name(), librarian._access_level))
+            cursor = self._cur
+            cursor.execute("""INSERT INTO librarians (id, name, access_level) VALUES (?, ?, ?)
+                              ON CONFLICT(id) DO UPDATE SET name=excluded.name,
+                                                            access_level=excluded.access_level""", 
+                         (librarian.get_id(), librarian.get_name(), librarian.get_access_level()))
             self._conn.commit()
-            if librarian not in self._librarians:
-                self._librarians.append(librarian)
-            logger.info(f"Библиотекарь '{librarian.get_name()}' зарегистрирован")
+            if self._librarians is not None:
+                existing = self._librarians_by_id.get(librarian.get_id())
+                if existing is None:
+                    self._librarians.append(librarian)
+                    self._librarians_by_id[librarian.get_id()] = librarian
+                elif existing is not librarian:
+                    existing.set_name(librarian.get_name())
+                    existing.set_access_level(librarian.get_access_level())
+            logger.info("Библиотекарь '%s' зарегистрирован", librarian.get_name())
         except sqlite3.Error as e:
-            logger.error(f"Ошибка регистрации библиотекаря: {e}")
+            logger.error("Ошибка регистрации библиотекаря: %s", e)
 
+    @_on_db_thread
     def issue_book(self, user_id, book_id):
         """Выдает книгу пользователю.
         
@@ -709,44 +1093,50 @@ class LibrarySystem:
             Loan: Выдача или None при ошибке
         """
         try:
-            user = next((u for u in self._users if u.get_id() == user_id), None)
-            book = next((b for b in self._books if b.get_id() == book_id), None)
+            user = self._users_by_id.get(user_id)
+            book = self._books_by_id.get(book_id)
             
             if not user:
-                logger.warning(f"Пользователь {user_id} не найден")
+                logger.warning("Пользователь %s не найден", user_id)
                 return None
             
             if not book:
-                logger.warning(f"Книга {book_id} не найдена")
+                logger.warning("Книга %s не найдена", book_id)
                 return None
             
             if not book.is_available():
-                logger.warning(f"Книга '{book.get_title()}' недоступна")
+                logger.warning("Книга '%s' недоступна", book.get_title())
                 return None
             
-            if len(user.get_borrowed_books()) >= User.MAX_BOOKS:
-                logger.warning(f"Пользователь {user.get_name()} достиг лимита книг")
+            if user.get_borrowed_count() >= User.MAX_BOOKS:
+                logger.warning("Пользователь %s достиг лимита книг", user.get_name())
                 return None
             
-            cursor = self._conn.cursor()
-            now = datetime.now()
-            cursor.execute("INSERT INTO loans (book_id, user_id, issue_date) VALUES (?, ?, ?)", 
-                         (book_id, user_id, now.isoformat()))
-            # Обновляем статус книги в БД и в памяти
-            cursor.execute("UPDATE books SET status=? WHERE id=?", ("выдана", book_id))
-            self._conn.commit()
+            cursor = self._cur
+            now = datetime.now().replace(microsecond=0)  # В БД хранятся целые секунды
+            # Выдача и статус книги - одна транзакция (commit или rollback)
+            with self._conn:
+                loan_id = self._insert("INSERT INTO loans (book_id, user_id, issue_ts) VALUES (?, ?, ?)", 
+                                       (book_id, user_id, int(now.timestamp())))
+                cursor.execute(self._SQL_SET_BOOK_STATUS, ("выдана", book_id))
 
-            loan_id = cursor.lastrowid
             loan = Loan(loan_id, book, user, now)
             book.set_status("выдана")
+            self._available_books.pop(book_id, None)
             user.borrow_book(book)
-            self._loans.append(loan)
-            logger.info(f"Книга '{book.get_title()}' выдана {user.get_name()}")
+            # Если выдачи еще не загружены, новая будет прочитана из БД вместе с остальными
+            if self._loans is not None:
+                self._loans.append(loan)
+                self._loans_by_id[loan_id] = loan
+                self._active_loans[loan_id] = loan
+            self._version += 1
+            logger.info("Книга '%s' выдана %s", book.get_title(), user.get_name())
             return loan
         except sqlite3.Error as e:
-            logger.error(f"Ошибка выдачи книги: {e}")
+            logger.error("Ошибка выдачи книги: %s", e)
             return None
 
+    @_on_db_thread
     def return_book(self, loan_id):
         """Возвращает книгу.
         
@@ -754,47 +1144,86 @@ class LibrarySystem:
             bool: True если успешно возвращена
         """
         try:
-            loan = next((l for l in self._loans if l.get_id() == loan_id), None)
+            self.get_loans()  # Гарантирует загрузку выдач
+            loan = self._loans_by_id.get(loan_id)
             if not loan or loan.get_return_date() is not None:
-                logger.warning(f"Выдача {loan_id} не найдена или уже возвращена")
+                logger.warning("Выдача %s не найдена или уже возвращена", loan_id)
                 return False
             
-            cursor = self._conn.cursor()
-            now = datetime.now()
-            cursor.execute("UPDATE loans SET return_date=? WHERE id=?", (now.isoformat(), loan_id))
-            # Обновляем статус книги в БД
-            cursor.execute("UPDATE books SET status=? WHERE id=?", ("доступна", loan.get_book().get_id()))
-            self._conn.commit()
+            cursor = self._cur
+            now = datetime.now().replace(microsecond=0)  # В БД хранятся целые секунды
+            # Возврат и статус книги - одна транзакция (commit или rollback)
+            with self._conn:
+                cursor.execute("UPDATE loans SET return_ts=? WHERE id=?", (int(now.timestamp()), loan_id))
+                cursor.execute(self._SQL_SET_BOOK_STATUS, ("доступна", loan.get_book().get_id()))
 
             loan.return_book(now)
             loan.get_book().set_status("доступна")
+            self._available_books[loan.get_book().get_id()] = loan.get_book()
+            self._active_loans.pop(loan_id, None)
             loan.get_user().return_book(loan.get_book())
-            logger.info(f"Книга '{loan.get_book().get_title()}' возвращена {loan.get_user().get_name()}")
+            self._version += 1
+            logger.info("Книга '%s' возвращена %s", loan.get_book().get_title(), loan.get_user().get_name())
             return True
         except sqlite3.Error as e:
-            logger.error(f"Ошибка возврата книги: {e}")
+            logger.error("Ошибка возврата книги: %s", e)
             return False
 
+    def get_version(self):
+        """Возвращает номер версии данных (меняется после каждого изменения)."""
+        return self._version
+
     def get_books(self):
         """Возвращает список всех книг."""
         return self._books
 
+    def get_available_books(self):
+        """Возвращает список доступных для выдачи книг в порядке каталога."""
+        available = self._available_books
+        return [b for b in self._books if b.get_id() in available]
+
     def get_users(self):
         """Возвращает список всех пользователей."""
         return self._users
 
+    @_on_db_thread
     def get_loans(self):
-        """Возвращает список всех выдач."""
+        """Возвращает список всех выдач (загружается из БД при первом обращении)."""
+        if self._loans is None:
+            self._loans = self._load_loans()
+            self._loans_by_id = {l.get_id(): l for l in self._loans}
+            self._active_loans = {l.get_id(): l for l in self._loans if l.get_return_date() is None}
         return self._loans
 
+    @_on_db_thread
     def get_librarians(self):
-        """Возвращает список всех библиотекарей."""
+        """Возвращает список всех библиотекарей (загружается из БД при первом обращении)."""
+        if self._librarians is None:
+            self._librarians = self._load_librarians()
+            self._librarians_by_id = {l.get_id(): l for l in self._librarians}
         return self._librarians
     
     def get_active_loans(self):
         """Возвращает список активных (невозвращенных) выдач."""
-        return [l for l in self._loans if l.get_return_date() is None]
+        self.get_loans()  # Гарантирует загрузку выдач
+        return list(self._active_loans.values())
+    
+    def get_overdue_loans(self):
+        """Возвращает список просроченных выдач."""
+        self.get_loans()  # Гарантирует загрузку выдач
+        now = datetime.now()
+        # Просроченной может быть только активная выдача
+        return [l for l in self._active_loans.values() if l.is_overdue(now)]
+    
+    def overdue_counts_by_user(self):
+        """Считает просроченные выдачи по пользователям за один проход.
+        
+        Returns:
+            Counter: ID пользователя -> количество просроченных выдач
+        """
+        return Counter(l.get_user().get_id() for l in self.get_overdue_loans())
     
+    @_on_db_thread
     def authenticate_librarian(self, librarian_id):
         """Проверяет, существует ли библиотекарь.
         
@@ -802,27 +1231,98 @@ class LibrarySystem:
             Librarian: Объект библиотекаря или None
         """
         try:
-            cursor = self._conn.cursor()
-            cursor.execute("SELECT id, name, access_level FROM librarians WHERE id=?", (librarian_id,))
+            cursor = self._cur
+            cursor.execute(self._SQL_GET_LIBRARIAN, (librarian_id,))
             row = cursor.fetchone()
             if row:
                 return Librarian(row[1], row[0], row[2])
             return None
         except sqlite3.Error as e:
-            logger.error(f"Ошибка проверки библиотекаря: {e}")
+            logger.error("Ошибка проверки библиотекаря: %s", e)
             return None
 
+    def submit(self, func, *args, **kwargs):
+        """Ставит операцию в очередь фонового потока БД.
+        
+        Args:
+            func (callable): Метод системы, например self.issue_book
+            *args: Аргументы метода
+            **kwargs: Именованные аргументы метода
+            
+        Returns:
+            Future: Результат операции, доступный после ее выполнения
+        """
+        future = Future()
+        self._tasks.put((future, func, args, kwargs))
+        return future
+
+    def _run_worker(self):
+        """Выполняет операции из очереди по одной, пока не получит None."""
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                break
+            future, func, args, kwargs = task
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func(*args, **kwargs))
+            except Exception as e:
+                logger.error("Ошибка фоновой операции %s: %s", getattr(func, '__name__', func), e)
+                future.set_exception(e)
+
     def close(self):
-        """Закрывает подключение к БД."""
+        """Дожидается фоновых операций и закрывает подключение к БД."""
         try:
+            self._tasks.put(None)
+            self._worker.join()
             self._conn.close()
             logger.info("Подключение к БД закрыто")
         except sqlite3.Error as e:
-            logger.error(f"Ошибка закрытия БД: {e}")
+            logger.error("Ошибка закрытия БД: %s", e)
 
 class LibraryApp:
     """Главное приложение с GUI на Tkinter."""
     
+    # Кнопки левого меню: (текст, имя метода)
+    _MENU_SPEC = (
+        ("📚 Добавить книгу", "show_add_book"),
+        ("👤 Зарегистрировать пользователя", "show_register_user"),
+        ("📤 Выдать книгу", "show_issue_book"),
+        ("📥 Вернуть книгу", "show_return_book"),
+        ("📖 Список книг", "show_list_books"),
+        ("📋 Список выдач", "show_list_loans"),
+        ("👥 Список пользователей", "show_list_users"),
+        ("✏️ Редактировать книгу", "show_edit_book"),
+        ("✏️ Редактировать пользователя", "show_edit_user"),
+        ("🚪 Выход", "_logout"),
+    )
+    
+    # Задержка поиска после последнего нажатия клавиши, мс
+    _SEARCH_DELAY = 150
+    # Высота строки Treeview в пикселях и число строк списка книг, пока высота таблицы неизвестна
+    _TREE_ROW_HEIGHT = 25
+    _MIN_VISIBLE_ROWS = 20
+    
+    # Стили ttk: имя стиля -> параметры style.configure / style.map
+    _STYLE_TABLE = {
+        "TButton": dict(padding=10, relief="flat", background="#607d8b",
+                        foreground="white", font=("Helvetica", 11)),
+        "TLabel": dict(font=("Helvetica", 11), background="#f5f5f5", foreground="#333333"),
+        "TEntry": dict(font=("Helvetica", 11), fieldbackground="#ffffff"),
+        "TCombobox": dict(font=("Helvetica", 11), fieldbackground="#ffffff"),
+        "Treeview": dict(font=("Helvetica", 10), rowheight=_TREE_ROW_HEIGHT,
+                         background="#ffffff", foreground="#333333"),
+        "Treeview.Heading": dict(font=("Helvetica", 11, "bold"),
+                                 background="#e0e0e0", foreground="#333333"),
+        "Title.TLabel": dict(font=("Helvetica", 14, "bold"),
+                             background="#f5f5f5", foreground="#1a1a1a"),
+    }
+    _STYLE_MAPS = {
+        "TButton": dict(background=[('active', '#546e7a')]),
+        "Treeview": dict(background=[('selected', '#cfd8dc')]),
+    }
+    
     def __init__(self, root):
         """Инициализирует приложение.
         
@@ -838,6 +1338,12 @@ class LibraryApp:
         
         # Переменная для хранения текущего библиотекаря
         self.current_librarian = None
+        self._closed = False
+        # Номер сеанса входа: растет при выходе, чтобы отбросить результаты операций старого сеанса
+        self._session = 0
+        
+        # Опции Combobox: имя набора -> (версия данных, (объекты, подписи))
+        self._options_cache = {}
         
         # Стиль
         self._configure_style()
@@ -846,23 +1352,18 @@ class LibraryApp:
         self._show_login_screen()
 
     def _configure_style(self):
-        """Настраивает стиль приложения."""
-        style = ttk.Style()
+        """Настраивает стиль приложения (один раз для каждого корневого окна)."""
+        # Стили ttk хранятся в интерпретаторе Tk, поэтому флаг ставится на само окно
+        if getattr(self.root, "_library_styles_configured", False):
+            return
+        self.root._library_styles_configured = True
+        
+        style = ttk.Style(self.root)
         style.theme_use('clam')
-        style.configure("TButton", padding=10, relief="flat", background="#607d8b", 
-                       foreground="white", font=("Helvetica", 11))
-        style.map("TButton", background=[('active', '#546e7a')])
-        style.configure("TLabel", font=("Helvetica", 11), background="#f5f5f5", 
-                       foreground="#333333")
-        style.configure("TEntry", font=("Helvetica", 11), fieldbackground="#ffffff")
-        style.configure("TCombobox", font=("Helvetica", 11), fieldbackground="#ffffff")
-        style.configure("Treeview", font=("Helvetica", 10), rowheight=25, 
-                       background="#ffffff", foreground="#333333")
-        style.configure("Treeview.Heading", font=("Helvetica", 11, "bold"), 
-                       background="#e0e0e0", foreground="#333333")
-        style.map("Treeview", background=[('selected', '#cfd8dc')])
-        style.configure("Title.TLabel", font=("Helvetica", 14, "bold"), 
-                       background="#f5f5f5", foreground="#1a1a1a")
+        for name, options in self._STYLE_TABLE.items():
+            style.configure(name, **options)
+        for name, options in self._STYLE_MAPS.items():
+            style.map(name, **options)
 
     def _show_login_screen(self):
         """Показывает экран входа."""
@@ -885,18 +1386,23 @@ class LibraryApp:
         def login():
             try:
                 librarian_id = int(id_entry.get())
-                librarian = self.system.authenticate_librarian(librarian_id)
-                
+            except ValueError:
+                messagebox.showerror("Ошибка", "ID должен быть числом!")
+                id_entry.delete(0, tk.END)
+                return
+            
+            def on_authenticated(librarian):
+                if self.current_librarian is not None:
+                    return  # Вход уже выполнен повторным нажатием
                 if librarian:
                     self.current_librarian = librarian
-                    logger.info(f"Вход библиотекаря {librarian.get_name()}")
+                    logger.info("Вход библиотекаря %s", librarian.get_name())
                     self._show_main_screen()
                 else:
                     messagebox.showerror("Ошибка", "Библиотекарь не найден!")
                     id_entry.delete(0, tk.END)
-            except ValueError:
-                messagebox.showerror("Ошибка", "ID должен быть числом!")
-                id_entry.delete(0, tk.END)
+            
+            self._run_in_background(on_authenticated, self.system.authenticate_librarian, librarian_id)
         
         ttk.Button(main_frame, text="Войти", command=login).pack(pady=10)
         
@@ -920,52 +1426,189 @@ class LibraryApp:
         self.menu_frame = ttk.Frame(self.main_pane, padding="10", width=200)
         self.main_pane.add(self.menu_frame, minsize=200)
         
-        ttk.Label(self.menu_frame, text=f"Библиотекарь:\n{self.current_librarian.get_name()}", 
+        ttk.Label(self.menu_frame, text=f"Библиотекарь:\n{self.current_librarian.get_name()}",
                  font=("Helvetica", 10, "bold")).pack(pady=10)
         ttk.Separator(self.menu_frame, orient='horizontal').pack(fill=tk.X, pady=10)
         
-        buttons = [
-            ("📚 Добавить книгу", self.show_add_book),
-            ("👤 Зарегистрировать пользователя", self.show_register_user),
-            ("📤 Выдать книгу", self.show_issue_book),
-            ("📥 Вернуть книгу", self.show_return_book),
-            ("📖 Список книг", self.show_list_books),
-            ("📋 Список выдач", self.show_list_loans),
-            ("👥 Список пользователей", self.show_list_users),
-            ("✏️ Редактировать книгу", self.show_edit_book),
-            ("✏️ Редактировать пользователя", self.show_edit_user),
-            ("🚪 Выход", self._logout)
-        ]
-        
-        for text, command in buttons:
-            ttk.Button(self.menu_frame, text=text, command=command).pack(fill=tk.X, pady=4)
+        for text, method_name in self._MENU_SPEC:
+            ttk.Button(self.menu_frame, text=text, command=getattr(self, method_name)).pack(fill=tk.X, pady=4)
         
         # Правое содержимое
         self.content_frame = ttk.Frame(self.main_pane, padding="20")
         self.main_pane.add(self.content_frame, minsize=400)
         
-        self.clear_content()
-        ttk.Label(self.content_frame, text="Добро пожаловать!", style="Title.TLabel").pack(pady=20)
-        ttk.Label(self.content_frame, 
-                 text="Выберите действие из меню слева для начала работы.").pack(pady=10)
+        # Экраны создаются при первом показе и затем только скрываются/показываются
+        self._screens = {}
+        self._current_screen = None
+        self._show_screen("welcome", self._build_welcome)
 
-    def clear_content(self):
-        """Очищает содержимое контент-панели."""
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
+    def _show_screen(self, name, build):
+        """Показывает экран контент-панели, создавая его виджеты только один раз.
+        
+        Args:
+            name (str): Имя экрана
+            build (callable): Создает виджеты экрана во фрейме и возвращает функцию его обновления
+        """
+        if self._current_screen is not None:
+            self._current_screen.pack_forget()
+        screen = self._screens.get(name)
+        if screen is None:
+            frame = ttk.Frame(self.content_frame)
+            screen = (frame, build(frame))
+            self._screens[name] = screen
+        frame, refresh = screen
+        refresh()
+        frame.pack(fill=tk.BOTH, expand=True)
+        self._current_screen = frame
+
+    def _build_welcome(self, parent):
+        """Создает приветственный экран."""
+        ttk.Label(parent, text="Добро пожаловать!", style="Title.TLabel").pack(pady=20)
+        ttk.Label(parent, text="Выберите действие из меню слева для начала работы.").pack(pady=10)
+        return lambda: None
 
     def _logout(self):
         """Выход из аккаунта."""
         self.current_librarian = None
+        # Незавершенные операции не должны обращаться к виджетам уничтоженного сеанса
+        self._session += 1
         logger.info("Пользователь вышел")
         self._show_login_screen()
 
+    def _run_in_background(self, on_done, func, *args):
+        """Выполняет операцию системы в фоновом потоке БД.
+        
+        Args:
+            on_done (callable): Вызывается в потоке Tk с результатом операции
+            func (callable): Метод системы
+            *args: Аргументы метода
+        """
+        self._poll(self.system.submit(func, *args), on_done, self._session)
+
+    def _poll(self, future, on_done, session):
+        """Периодически проверяет Future, не блокируя цикл событий Tk.
+        
+        Args:
+            future (Future): Результат операции
+            on_done (callable): Обработчик результата
+            session (int): Номер сеанса, в котором операция была запущена
+        """
+        if session != self._session:
+            return  # После выхода виджеты сеанса уничтожены
+        if not future.done():
+            self.root.after(50, self._poll, future, on_done, session)
+            return
+        try:
+            result = future.result()
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Ошибка: {str(e)}")
+            return
+        on_done(result)
+
+    def _debounce(self, func):
+        """Откладывает вызов func, пока пользователь печатает.
+        
+        Args:
+            func (callable): Вызывается без аргументов через _SEARCH_DELAY мс после последнего вызова
+            
+        Returns:
+            callable: Планирует вызов func, отменяя ранее запланированный
+        """
+        pending = None
+        session = self._session
+        
+        def run():
+            nonlocal pending
+            pending = None
+            if session == self._session:  # После выхода виджеты экрана уничтожены
+                func()
+        
+        def schedule(event=None):
+            nonlocal pending
+            if pending is not None:
+                self.root.after_cancel(pending)
+            pending = self.root.after(self._SEARCH_DELAY, run)
+        
+        return schedule
+
+    def _cached_options(self, key, build):
+        """Возвращает опции Combobox, пересобирая их только после изменения данных.
+        
+        Args:
+            key (str): Имя набора опций
+            build (callable): Возвращает кортеж (список объектов, список подписей)
+            
+        Returns:
+            tuple: (список объектов, список подписей) с совпадающими индексами
+        """
+        version = self.system.get_version()
+        cached = self._options_cache.get(key)
+        if cached is None or cached[0] != version:
+            cached = (version, build())
+            self._options_cache[key] = cached
+        return cached[1]
+    
+    def _build_user_options(self):
+        """Строит опции выбора пользователя."""
+        users = list(self.system.get_users())
+        return users, [f"{u.get_name()} (ID: {u.get_id()})" for u in users]
+    
+    def _build_bio_field(self, parent):
+        """Создает поле биографии автора.
+        
+        По умолчанию это однострочный ttk.Entry; tk.Text создается,
+        только если пользователь попросит многострочное поле.
+        
+        Args:
+            parent (ttk.Frame): Фрейм формы
+            
+        Returns:
+            tuple: (get_bio, set_bio) - чтение и запись текста поля
+        """
+        row = ttk.Frame(parent)
+        row.pack(fill=tk.BOTH, expand=True, pady=5)
+        bio_var = tk.StringVar()
+        bio_entry = ttk.Entry(row, textvariable=bio_var, width=40)
+        bio_text = [None]
+        
+        def expand():
+            text = tk.Text(row, height=4, width=40, font=("Helvetica", 10))
+            text.insert("1.0", bio_var.get())
+            bio_entry.pack_forget()
+            expand_button.pack_forget()
+            text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+            bio_text[0] = text
+        
+        def get_bio():
+            if bio_text[0] is not None:
+                return bio_text[0].get("1.0", tk.END)
+            return bio_var.get()
+        
+        def set_bio(bio):
+            if bio_text[0] is not None:
+                bio_text[0].delete("1.0", tk.END)
+                bio_text[0].insert("1.0", bio)
+            else:
+                bio_var.set(bio)
+        
+        expand_button = ttk.Button(row, text="✎ Многострочный", command=expand)
+        expand_button.pack(side=tk.RIGHT, padx=(5, 0))
+        bio_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        return get_bio, set_bio
+    
     def show_add_book(self):
         """Показывает форму добавления книги."""
-        self.clear_content()
-        ttk.Label(self.content_frame, text="Добавить книгу", style="Title.TLabel").pack(pady=10)
+        self._show_screen("add_book", self._build_add_book)
+
+    def _build_add_book(self, parent):
+        """Создает форму добавления книги.
+        
+        Returns:
+            callable: Очищает форму перед показом
+        """
+        ttk.Label(parent, text="Добавить книгу", style="Title.TLabel").pack(pady=10)
         
-        frame = ttk.Frame(self.content_frame)
+        frame = ttk.Frame(parent)
         frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         ttk.Label(frame, text="Название книги:").pack(anchor="w", pady=(10, 0))
@@ -977,17 +1620,25 @@ class LibraryApp:
         author_entry.pack(fill=tk.X, pady=5)
         
         ttk.Label(frame, text="Биография автора:").pack(anchor="w", pady=(10, 0))
-        bio_text = tk.Text(frame, height=4, width=40, font=("Helvetica", 10))
-        bio_text.pack(fill=tk.BOTH, expand=True, pady=5)
+        get_bio, set_bio = self._build_bio_field(frame)
         
         ttk.Label(frame, text="Год издания:").pack(anchor="w", pady=(10, 0))
         year_entry = ttk.Entry(frame, width=40)
         year_entry.pack(fill=tk.X, pady=5)
         
+        status_label = ttk.Label(frame, text="")
+        
+        def reset():
+            title_entry.delete(0, tk.END)
+            author_entry.delete(0, tk.END)
+            set_bio("")
+            year_entry.delete(0, tk.END)
+            status_label.configure(text="")
+        
         def add():
             title = title_entry.get().strip()
             author_name = author_entry.get().strip()
-            bio = bio_text.get("1.0", tk.END).strip()
+            bio = get_bio().strip()
             year_str = year_entry.get().strip()
             
             if not title:
@@ -1002,30 +1653,49 @@ class LibraryApp:
                 year = int(year_str)
                 if year <= 0 or year > 2100:
                     raise ValueError("Год должен быть между 1 и 2100")
-                
-                if self.system.add_book(title, author_name, bio, year):
+            except ValueError as e:
+                messagebox.showerror("Ошибка", f"Год должен быть числом (1-2100)! {str(e)}")
+                return
+            
+            def on_added(added):
+                if added:
                     messagebox.showinfo("Успех", f"Книга '{title}' добавлена успешно!")
-                    self.clear_content()
-                    ttk.Label(self.content_frame, text="✓ Книга добавлена успешно").pack(pady=20)
+                    reset()
+                    status_label.configure(text="✓ Книга добавлена успешно")
                 else:
                     messagebox.showerror("Ошибка", "Не удалось добавить книгу (возможно, автор уже существует).")
-            except ValueError as e:
-                messagebox.showerror("Ошибка", f"Год должен быть числом (1-2100)! {str(e)}")
+            
+            self._run_in_background(on_added, self.system.add_book, title, author_name, bio, year)
         
         ttk.Button(frame, text="Добавить", command=add).pack(pady=20)
+        status_label.pack(pady=5)
+        return reset
 
     def show_register_user(self):
         """Показывает форму регистрации пользователя."""
-        self.clear_content()
-        ttk.Label(self.content_frame, text="Зарегистрировать пользователя", style="Title.TLabel").pack(pady=10)
+        self._show_screen("register_user", self._build_register_user)
+
+    def _build_register_user(self, parent):
+        """Создает форму регистрации пользователя.
+        
+        Returns:
+            callable: Очищает форму перед показом
+        """
+        ttk.Label(parent, text="Зарегистрировать пользователя", style="Title.TLabel").pack(pady=10)
         
-        frame = ttk.Frame(self.content_frame)
+        frame = ttk.Frame(parent)
         frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         ttk.Label(frame, text="Имя пользователя:").pack(anchor="w", pady=(10, 0))
         name_entry = ttk.Entry(frame, width=40)
         name_entry.pack(fill=tk.X, pady=5)
-        name_entry.focus()
+        
+        status_label = ttk.Label(frame, text="")
+        
+        def reset():
+            name_entry.delete(0, tk.END)
+            status_label.configure(text="")
+            name_entry.focus()
         
         def register():
             name = name_entry.get().strip()
@@ -1033,99 +1703,144 @@ class LibraryApp:
                 messagebox.showerror("Ошибка", "Введите имя пользователя!")
                 return
             
-            user = self.system.register_user(name)
-            if user:
-                messagebox.showinfo("Успех", f"Пользователь '{name}' (ID: {user.get_id()}) зарегистрирован!")
-                self.clear_content()
-                ttk.Label(self.content_frame, 
-                         text=f"✓ Пользователь зарегистрирован\nID: {user.get_id()}").pack(pady=20)
-            else:
-                messagebox.showerror("Ошибка", "Не удалось зарегистрировать пользователя.")
+            def on_registered(user):
+                if user:
+                    messagebox.showinfo("Успех", f"Пользователь '{name}' (ID: {user.get_id()}) зарегистрирован!")
+                    reset()
+                    status_label.configure(text=f"✓ Пользователь зарегистрирован\nID: {user.get_id()}")
+                else:
+                    messagebox.showerror("Ошибка", "Не удалось зарегистрировать пользователя.")
+            
+            self._run_in_background(on_registered, self.system.register_user, name)
         
         ttk.Button(frame, text="Зарегистрировать", command=register).pack(pady=20)
+        status_label.pack(pady=5)
+        return reset
 
     def show_issue_book(self):
         """Показывает форму выдачи книги с Combobox."""
-        self.clear_content()
-        ttk.Label(self.content_frame, text="Выдать книгу", style="Title.TLabel").pack(pady=10)
+        self._show_screen("issue_book", self._build_issue_book)
+
+    def _build_issue_book(self, parent):
+        """Создает форму выдачи книги.
         
-        frame = ttk.Frame(self.content_frame)
+        Returns:
+            callable: Обновляет списки пользователей и доступных книг
+        """
+        ttk.Label(parent, text="Выдать книгу", style="Title.TLabel").pack(pady=10)
+        
+        frame = ttk.Frame(parent)
         frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         # Выбор пользователя
         ttk.Label(frame, text="Выберите пользователя:").pack(anchor="w", pady=(10, 0))
-        users = self.system.get_users()
-        user_options = [f"{u.get_name()} (ID: {u.get_id()})" for u in users]
-        user_combo = ttk.Combobox(frame, values=user_options, state="readonly", width=38)
+        user_combo = ttk.Combobox(frame, state="readonly", width=38)
         user_combo.pack(fill=tk.X, pady=5)
         
         # Выбор книги
         ttk.Label(frame, text="Выберите книгу:").pack(anchor="w", pady=(10, 0))
-        books = [b for b in self.system.get_books() if b.is_available()]
-        book_options = [f"{b.get_title()} ({b.get_author().get_name()}, {b.get_year()})" for b in books]
-        book_combo = ttk.Combobox(frame, values=book_options, state="readonly", width=38)
+        book_combo = ttk.Combobox(frame, state="readonly", width=38)
         book_combo.pack(fill=tk.X, pady=5)
         
-        if not books:
-            ttk.Label(frame, text="⚠️ Нет доступных книг!", foreground="red").pack(pady=10)
-        
-        if not users:
-            ttk.Label(frame, text="⚠️ Нет зарегистрированных пользователей!", foreground="red").pack(pady=10)
+        books_warning = ttk.Label(frame, text="", foreground="red")
+        books_warning.pack(pady=10)
+        users_warning = ttk.Label(frame, text="", foreground="red")
+        users_warning.pack(pady=10)
+        
+        users = []
+        books = []
+        
+        def build_book_options():
+            books = self.system.get_available_books()
+            return books, [f"{b.get_title()} ({b.get_author().get_name()}, {b.get_year()}, ID: {b.get_id()})" for b in books]
+        
+        def refresh():
+            nonlocal users, books
+            users, user_options = self._cached_options("users", self._build_user_options)
+            books, book_options = self._cached_options("available_books", build_book_options)
+            user_combo.configure(values=user_options)
+            user_combo.set("")
+            book_combo.configure(values=book_options)
+            book_combo.set("")
+            books_warning.configure(text="" if books else "⚠️ Нет доступных книг!")
+            users_warning.configure(text="" if users else "⚠️ Нет зарегистрированных пользователей!")
         
         def issue():
-            if not user_combo.get():
+            if user_combo.current() < 0:
                 messagebox.showerror("Ошибка", "Выберите пользователя!")
                 return
             
-            if not book_combo.get():
+            if book_combo.current() < 0:
                 messagebox.showerror("Ошибка", "Выберите книгу!")
                 return
             
             try:
-                user_id = int(user_combo.get().split("ID: ")[1].rstrip(")"))
-                book_title = book_combo.get().split(" (")[0]
-                book = next((b for b in self.system.get_books() if b.get_title() == book_title), None)
-                
-                if not book:
-                    messagebox.showerror("Ошибка", "Книга не найдена.")
-                    return
+                # Индекс в Combobox совпадает с индексом в исходном списке
+                user = users[user_combo.current()]
+                book = books[book_combo.current()]
                 
-                loan = self.system.issue_book(user_id, book.get_id())
-                if loan:
-                    messagebox.showinfo("Успех", f"Книга выдана!\nВозврат до: {(loan.get_issue_date() + timedelta(days=14)).strftime('%d.%m.%Y')}")
-                    self.show_list_loans()  # Автообновление
-                else:
-                    user = next((u for u in self.system.get_users() if u.get_id() == user_id), None)
-                    if user and len(user.get_borrowed_books()) >= User.MAX_BOOKS:
+                def on_issued(loan):
+                    if loan:
+                        messagebox.showinfo("Успех", f"Книга выдана!\nВозврат до: {loan.get_due_date_str()}")
+                        self.show_list_loans()  # Автообновление
+                    elif user.get_borrowed_count() >= User.MAX_BOOKS:
                         messagebox.showerror("Ошибка", f"Пользователь уже взял максимум ({User.MAX_BOOKS}) книг!")
                     else:
                         messagebox.showerror("Ошибка", "Не удалось выдать книгу.")
+                
+                self._run_in_background(on_issued, self.system.issue_book, user.get_id(), book.get_id())
             except Exception as e:
                 messagebox.showerror("Ошибка", f"Ошибка: {str(e)}")
         
         ttk.Button(frame, text="Выдать", command=issue).pack(pady=20)
+        return refresh
 
     def show_return_book(self):
         """Показывает форму возврата книги с Combobox."""
-        self.clear_content()
-        ttk.Label(self.content_frame, text="Вернуть книгу", style="Title.TLabel").pack(pady=10)
+        self._show_screen("return_book", self._build_return_book)
+
+    def _build_return_book(self, parent):
+        """Создает форму возврата книги.
         
-        frame = ttk.Frame(self.content_frame)
-        frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        Returns:
+            callable: Обновляет список активных выдач
+        """
+        ttk.Label(parent, text="Вернуть книгу", style="Title.TLabel").pack(pady=10)
+        loading_label = ttk.Label(parent, text="Загрузка…")
         
-        loans = self.system.get_active_loans()
-        if not loans:
-            ttk.Label(frame, text="Нет активных выдач!", foreground="red").pack(pady=20)
-            ttk.Button(frame, text="Назад", command=lambda: self.show_list_loans()).pack(pady=10)
-            return
+        # Заглушка на случай, когда возвращать нечего
+        empty_frame = ttk.Frame(parent)
+        ttk.Label(empty_frame, text="Нет активных выдач!", foreground="red").pack(pady=20)
+        ttk.Button(empty_frame, text="Назад", command=lambda: self.show_list_loans()).pack(pady=10)
         
+        frame = ttk.Frame(parent)
         ttk.Label(frame, text="Выберите выдачу для возврата:").pack(anchor="w", pady=(10, 0))
-        
-        loan_options = [f"{l.get_book().get_title()} - {l.get_user().get_name()} (Выдана: {l.get_issue_date().strftime('%d.%m.%Y')})" 
-                       for l in loans]
-        loan_combo = ttk.Combobox(frame, values=loan_options, state="readonly", width=50)
+        loan_combo = ttk.Combobox(frame, state="readonly", width=50)
         loan_combo.pack(fill=tk.X, pady=5)
         
+        loans = []
+        
+        def refresh():
+            # Выдачи читаются из БД при первом обращении - делаем это в потоке БД
+            frame.pack_forget()
+            empty_frame.pack_forget()
+            loading_label.pack(pady=20)
+            self._run_in_background(on_loaded, self.system.get_active_loans)
+        
+        def on_loaded(active_loans):
+            nonlocal loans
+            loading_label.pack_forget()
+            loans, loan_options = self._cached_options("active_loans", lambda: (
+                active_loans,
+                [f"{l.get_book().get_title()} - {l.get_user().get_name()} (Выдана: {l.get_issue_date_str()})"
+                 for l in active_loans]))
+            loan_combo.configure(values=loan_options)
+            loan_combo.set("")
+            if loans:
+                frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+            else:
+                empty_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
         def return_book():
             if not loan_combo.get():
                 messagebox.showerror("Ошибка", "Выберите выдачу!")
@@ -1135,24 +1850,36 @@ class LibraryApp:
                 index = loan_combo.current()
                 loan = loans[index]
                 
-                if self.system.return_book(loan.get_id()):
-                    status = "ПРОСРОЧЕНО" if (datetime.now() - loan.get_issue_date()).days > 14 else "Вовремя"
-                    messagebox.showinfo("Успех", f"Книга возвращена! ({status})")
-                    self.show_list_loans()  # Автообновление
-                else:
-                    messagebox.showerror("Ошибка", "Не удалось вернуть книгу.")
+                def on_returned(returned):
+                    if returned:
+                        # is_overdue() после возврата всегда False, сравниваем со сроком напрямую
+                        status = "ПРОСРОЧЕНО" if datetime.now() > loan.get_due_date() else "Вовремя"
+                        messagebox.showinfo("Успех", f"Книга возвращена! ({status})")
+                        self.show_list_loans()  # Автообновление
+                    else:
+                        messagebox.showerror("Ошибка", "Не удалось вернуть книгу.")
+                
+                self._run_in_background(on_returned, self.system.return_book, loan.get_id())
             except Exception as e:
                 messagebox.showerror("Ошибка", f"Ошибка: {str(e)}")
         
         ttk.Button(frame, text="Вернуть", command=return_book).pack(pady=20)
+        return refresh
 
     def show_list_books(self):
         """Показывает список книг с поиском и скроллбаром."""
-        self.clear_content()
-        ttk.Label(self.content_frame, text="Список книг", style="Title.TLabel").pack(pady=10)
+        self._show_screen("list_books", self._build_list_books)
+
+    def _build_list_books(self, parent):
+        """Создает экран списка книг.
+        
+        Returns:
+            callable: Обновляет таблицу с учетом текущего фильтра
+        """
+        ttk.Label(parent, text="Список книг", style="Title.TLabel").pack(pady=10)
         
         # Поиск
-        search_frame = ttk.Frame(self.content_frame)
+        search_frame = ttk.Frame(parent)
         search_frame.pack(fill=tk.X, padx=10, pady=5)
         
         ttk.Label(search_frame, text="Поиск:").pack(side=tk.LEFT, padx=5)
@@ -1161,15 +1888,15 @@ class LibraryApp:
         search_entry.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
         
         # Таблица
-        tree_frame = ttk.Frame(self.content_frame)
+        tree_frame = ttk.Frame(parent)
         tree_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
         scrollbar = ttk.Scrollbar(tree_frame)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
-        tree = ttk.Treeview(tree_frame, columns=("ID", "Название", "Автор", "Биография", "Год", "Статус"), 
-                           show="headings", yscrollcommand=scrollbar.set)
-        scrollbar.config(command=tree.yview)
+        # Прокруткой управляет не таблица, а окно видимых строк (см. render_window)
+        tree = ttk.Treeview(tree_frame, columns=("ID", "Название", "Автор", "Биография", "Год", "Статус"),
+                           show="headings")
         
         tree.heading("ID", text="ID")
         tree.heading("Название", text="Название")
@@ -1185,45 +1912,138 @@ class LibraryApp:
         tree.column("Год", width=60)
         tree.column("Статус", width=80)
         
+        tree.tag_configure("доступна", foreground="green")
+        tree.tag_configure("выдана", foreground="red")
+        # Экран показывается после заполнения таблицы, так что геометрия считается один раз
         tree.pack(fill=tk.BOTH, expand=True)
         
+        # Виртуальный список: в таблицу вставляются только строки видимого окна.
+        # Отрисованные строки: book_id -> значения; iid строки равен ID книги
+        book_rows = {}
+        books_shown = []  # Все книги текущего фильтра
+        first = 0  # Индекс первой видимой книги
+        seq = 0  # Номер последнего запроса поиска
+        
         def display_books(filter_text=""):
-            tree.delete(*tree.get_children())
-            books = self.system.get_books()
-            if filter_text:
-                books = self.system.find_book_by_title(filter_text)
+            nonlocal seq
+            # Результаты запросов, обогнанных более поздним, отбрасываются
+            seq += 1
+            request = seq
+            if not filter_text:
+                render_books(self.system.get_books())
+                return
+            
+            def on_found(books):
+                if request == seq:
+                    render_books(books)
             
-            for book in books:
+            self._run_in_background(on_found, self.system.find_book_by_title, filter_text)
+        
+        def render_books(books):
+            nonlocal books_shown
+            books_shown = books
+            render_window()
+        
+        def visible_count():
+            height = tree.winfo_height()
+            if height <= 1:
+                # До отображения окна высота неизвестна: заполняем таблицу с запасом
+                return self._MIN_VISIBLE_ROWS
+            # Высота заголовка не вычитается: лишняя строка окна служит запасом,
+            # а у нижнего края списка ее показывает прокрутка самой таблицы
+            return max(height // self._TREE_ROW_HEIGHT, 1)
+        
+        def render_window():
+            nonlocal first, book_rows
+            count = visible_count()
+            total = len(books_shown)
+            first = max(0, min(first, total - count))
+            
+            rows = {}
+            for book in books_shown[first:first + count]:
                 status_tag = "доступна" if book.is_available() else "выдана"
-                tree.insert("", "end", values=(
+                author = book.get_author()
+                rows[book.get_id()] = (
                     book.get_id(),
                     book.get_title(),
-                    book.get_author().get_name(),
-                    book.get_author().get_bio()[:30] + "..." if len(book.get_author().get_bio()) > 30 else book.get_author().get_bio(),
+                    author.get_name(),
+                    author.get_short_bio(),
                     book.get_year(),
                     status_tag
-                ), tags=(status_tag,))
+                )
             
-            tree.tag_configure("доступна", foreground="green")
-            tree.tag_configure("выдана", foreground="red")
+            # Трогаем только исчезнувшие, новые и изменившиеся строки
+            removed = book_rows.keys() - rows.keys()
+            if removed:
+                tree.delete(*(str(book_id) for book_id in removed))
+            for index, (book_id, values) in enumerate(rows.items()):
+                old_values = book_rows.get(book_id)
+                if old_values is None:
+                    tree.insert("", index, iid=str(book_id), values=values, tags=(values[-1],))
+                elif old_values != values:
+                    tree.item(str(book_id), values=values, tags=(values[-1],))
+            book_rows = rows
+            # У конца списка прокручиваем саму таблицу вниз, чтобы последние строки не остались под краем
+            tree.yview_moveto(1.0 if first + count >= total else 0.0)
+            
+            if total:
+                scrollbar.set(first / total, min(first + count, total) / total)
+            else:
+                scrollbar.set(0.0, 1.0)
+        
+        def on_scroll(action, amount, unit=None):
+            # Протокол команды ttk.Scrollbar: ("moveto", доля) или ("scroll", шаг, "units"/"pages")
+            nonlocal first
+            if action == "moveto":
+                first = int(float(amount) * len(books_shown))
+            else:
+                first += int(amount) * (visible_count() if unit == "pages" else 1)
+            render_window()
+        
+        def on_wheel(event):
+            nonlocal first
+            first += -3 if event.num == 4 or event.delta > 0 else 3
+            render_window()
+            return "break"
         
-        search_var.trace("w", lambda *args: display_books(search_var.get()))
-        display_books()
+        scrollbar.config(command=on_scroll)
+        tree.bind("<MouseWheel>", on_wheel)
+        tree.bind("<Button-4>", on_wheel)
+        tree.bind("<Button-5>", on_wheel)
+        # При изменении размера окна меняется число видимых строк
+        tree.bind("<Configure>", lambda event: render_window())
         
-        ttk.Button(self.content_frame, text="🔄 Обновить", command=lambda: display_books(search_var.get())).pack(pady=5)
+        def run_search():
+            nonlocal first
+            first = 0  # Новый фильтр показываем с начала
+            display_books(search_var.get())
+        
+        search_entry.bind("<KeyRelease>", self._debounce(run_search))
+        
+        ttk.Button(parent, text="🔄 Обновить", command=lambda: display_books(search_var.get())).pack(pady=5)
+        return lambda: display_books(search_var.get())
 
     def show_list_loans(self):
         """Показывает список выдач с индикатором просрочки."""
-        self.clear_content()
-        ttk.Label(self.content_frame, text="Список выдач", style="Title.TLabel").pack(pady=10)
+        self._show_screen("list_loans", self._build_list_loans)
+
+    def _build_list_loans(self, parent):
+        """Создает экран списка выдач.
         
-        tree_frame = ttk.Frame(self.content_frame)
+        Returns:
+            callable: Перестраивает таблицу активных выдач
+        """
+        ttk.Label(parent, text="Список выдач", style="Title.TLabel").pack(pady=10)
+        loading_label = ttk.Label(parent, text="")
+        loading_label.pack()
+        
+        tree_frame = ttk.Frame(parent)
         tree_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
         scrollbar = ttk.Scrollbar(tree_frame)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
-        tree = ttk.Treeview(tree_frame, columns=("ID", "Книга", "Пользователь", "Выдана", "Возврат до", "Статус"), 
+        tree = ttk.Treeview(tree_frame, columns=("ID", "Книга", "Пользователь", "Выдана", "Возврат до", "Статус"),
                            show="headings", yscrollcommand=scrollbar.set)
         scrollbar.config(command=tree.yview)
         
@@ -1241,12 +2061,21 @@ class LibraryApp:
         tree.column("Возврат до", width=90)
         tree.column("Статус", width=90)
         
+        tree.tag_configure("overdue", foreground="red", background="#ffcccc")
+        tree.tag_configure("ok", foreground="green")
         tree.pack(fill=tk.BOTH, expand=True)
         
-        for loan in self.system.get_loans():
-            if loan.get_return_date() is None:  # Только активные выдачи
-                due_date = loan.get_issue_date() + timedelta(days=14)
-                is_overdue = loan.is_overdue()
+        def display_loans():
+            # Выдачи читаются из БД при первом обращении - делаем это в потоке БД
+            loading_label.configure(text="Загрузка…")
+            self._run_in_background(render_loans, self.system.get_active_loans)
+        
+        def render_loans(loans):
+            loading_label.configure(text="")
+            tree.delete(*tree.get_children())
+            now = datetime.now()  # Один момент времени на всю таблицу
+            for loan in loans:
+                is_overdue = loan.is_overdue(now)
                 status = "ПРОСРОЧЕНО ⚠️" if is_overdue else "OK"
                 tag = "overdue" if is_overdue else "ok"
                 
@@ -1254,23 +2083,28 @@ class LibraryApp:
                     loan.get_id(),
                     loan.get_book().get_title(),
                     loan.get_user().get_name(),
-                    loan.get_issue_date().strftime('%d.%m.%Y'),
-                    due_date.strftime('%d.%m.%Y'),
+                    loan.get_issue_date_str(),
+                    loan.get_due_date_str(),
                     status
                 ), tags=(tag,))
         
-        tree.tag_configure("overdue", foreground="red", background="#ffcccc")
-        tree.tag_configure("ok", foreground="green")
-        
-        ttk.Button(self.content_frame, text="🔄 Обновить", command=self.show_list_loans).pack(pady=5)
+        ttk.Button(parent, text="🔄 Обновить", command=display_loans).pack(pady=5)
+        return display_loans
 
     def show_list_users(self):
         """Показывает список пользователей с поиском."""
-        self.clear_content()
-        ttk.Label(self.content_frame, text="Список пользователей", style="Title.TLabel").pack(pady=10)
+        self._show_screen("list_users", self._build_list_users)
+
+    def _build_list_users(self, parent):
+        """Создает экран списка пользователей.
+        
+        Returns:
+            callable: Обновляет таблицу с учетом текущего фильтра
+        """
+        ttk.Label(parent, text="Список пользователей", style="Title.TLabel").pack(pady=10)
         
         # Поиск
-        search_frame = ttk.Frame(self.content_frame)
+        search_frame = ttk.Frame(parent)
         search_frame.pack(fill=tk.X, padx=10, pady=5)
         
         ttk.Label(search_frame, text="Поиск:").pack(side=tk.LEFT, padx=5)
@@ -1279,13 +2113,13 @@ class LibraryApp:
         search_entry.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
         
         # Таблица
-        tree_frame = ttk.Frame(self.content_frame)
+        tree_frame = ttk.Frame(parent)
         tree_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
         scrollbar = ttk.Scrollbar(tree_frame)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
-        tree = ttk.Treeview(tree_frame, columns=("ID", "Имя", "Взятых книг"), 
+        tree = ttk.Treeview(tree_frame, columns=("ID", "Имя", "Взятых книг"),
                            show="headings", yscrollcommand=scrollbar.set)
         scrollbar.config(command=tree.yview)
         
@@ -1297,60 +2131,93 @@ class LibraryApp:
         tree.column("Имя", width=200)
         tree.column("Взятых книг", width=100)
         
-        tree.pack(fill=tk.BOTH, expand=True)
+        seq = 0  # Номер последнего запроса поиска
         
         def display_users(filter_text=""):
-            tree.delete(*tree.get_children())
-            users = self.system.get_users()
-            if filter_text:
-                users = self.system.find_user_by_name(filter_text)
+            nonlocal seq
+            # Результаты запросов, обогнанных более поздним, отбрасываются
+            seq += 1
+            request = seq
+            if not filter_text:
+                render_users(self.system.get_users())
+                return
             
+            def on_found(users):
+                if request == seq:
+                    render_users(users)
+            
+            # Поиск идет через FTS в БД, поэтому выполняется в фоновом потоке
+            self._run_in_background(on_found, self.system.find_user_by_name, filter_text)
+        
+        def render_users(users):
+            # Полная перестройка идет на скрытой таблице
+            tree.pack_forget()
+            tree.delete(*tree.get_children())
             for user in users:
                 tree.insert("", "end", values=(
                     user.get_id(),
                     user.get_name(),
-                    len(user.get_borrowed_books())
+                    user.get_borrowed_count()
                 ))
+            tree.pack(fill=tk.BOTH, expand=True)
         
-        search_var.trace("w", lambda *args: display_users(search_var.get()))
-        display_users()
+        search_entry.bind("<KeyRelease>", self._debounce(lambda: display_users(search_var.get())))
         
-        ttk.Button(self.content_frame, text="🔄 Обновить", command=lambda: display_users(search_var.get())).pack(pady=5)
+        ttk.Button(parent, text="🔄 Обновить", command=lambda: display_users(search_var.get())).pack(pady=5)
+        return lambda: display_users(search_var.get())
 
     def show_edit_book(self):
         """Показывает форму редактирования книги."""
-        self.clear_content()
-        ttk.Label(self.content_frame, text="Редактировать книгу", style="Title.TLabel").pack(pady=10)
+        self._show_screen("edit_book", self._build_edit_book)
+
+    def _build_edit_book(self, parent):
+        """Создает форму редактирования книги.
+        
+        Returns:
+            callable: Обновляет список книг и очищает форму
+        """
+        ttk.Label(parent, text="Редактировать книгу", style="Title.TLabel").pack(pady=10)
         
-        frame = ttk.Frame(self.content_frame)
+        frame = ttk.Frame(parent)
         frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         # Выбор книги
         ttk.Label(frame, text="Выберите книгу:").pack(anchor="w", pady=(10, 0))
-        books = self.system.get_books()
-        book_options = [f"{b.get_title()} (ID: {b.get_id()})" for b in books]
-        book_combo = ttk.Combobox(frame, values=book_options, state="readonly", width=40)
+        book_combo = ttk.Combobox(frame, state="readonly", width=40)
         book_combo.pack(fill=tk.X, pady=5)
         
-        if not books:
-            ttk.Label(frame, text="Нет книг для редактирования!", foreground="red").pack(pady=20)
-            return
+        empty_label = ttk.Label(frame, text="", foreground="red")
+        empty_label.pack()
         
+        books = []
         selected_book = [None]
         
+        def build_book_options():
+            books = list(self.system.get_books())
+            return books, [f"{b.get_title()} (ID: {b.get_id()})" for b in books]
+        
+        def refresh():
+            nonlocal books
+            books, book_options = self._cached_options("books", build_book_options)
+            book_combo.configure(values=book_options)
+            book_combo.set("")
+            empty_label.configure(text="" if books else "Нет книг для редактирования!")
+            selected_book[0] = None
+            title_entry.delete(0, tk.END)
+            year_entry.delete(0, tk.END)
+            set_bio("")
+        
         def on_book_select(event=None):
-            if not book_combo.get():
+            if book_combo.current() < 0:
                 return
-            book_id = int(book_combo.get().split("ID: ")[1].rstrip(")"))
-            selected_book[0] = next((b for b in books if b.get_id() == book_id), None)
+            selected_book[0] = books[book_combo.current()]
             
             if selected_book[0]:
                 title_entry.delete(0, tk.END)
                 title_entry.insert(0, selected_book[0].get_title())
                 year_entry.delete(0, tk.END)
                 year_entry.insert(0, str(selected_book[0].get_year()))
-                bio_text.delete("1.0", tk.END)
-                bio_text.insert("1.0", selected_book[0].get_author().get_bio())
+                set_bio(selected_book[0].get_author().get_bio())
         
         book_combo.bind("<<ComboboxSelected>>", on_book_select)
         
@@ -1364,8 +2231,7 @@ class LibraryApp:
         year_entry.pack(fill=tk.X, pady=5)
         
         ttk.Label(frame, text="Биография автора:").pack(anchor="w", pady=(10, 0))
-        bio_text = tk.Text(frame, height=4, width=40, font=("Helvetica", 10))
-        bio_text.pack(fill=tk.BOTH, expand=True, pady=5)
+        get_bio, set_bio = self._build_bio_field(frame)
         
         def save():
             if not selected_book[0]:
@@ -1374,25 +2240,30 @@ class LibraryApp:
             
             title = title_entry.get().strip()
             year_str = year_entry.get().strip()
-            bio = bio_text.get("1.0", tk.END).strip()
+            bio = get_bio().strip()
             
             try:
                 year = int(year_str) if year_str else None
                 if year and (year <= 0 or year > 2100):
                     raise ValueError("Год должен быть между 1 и 2100")
-                
-                if self.system.edit_book(selected_book[0].get_id(), title if title else None, 
-                                        year, bio if bio else None):
+            except ValueError as e:
+                messagebox.showerror("Ошибка", f"Неверный год: {str(e)}")
+                return
+            
+            def on_saved(saved):
+                if saved:
                     messagebox.showinfo("Успех", "Книга отредактирована!")
                     self.show_list_books()
                 else:
                     messagebox.showerror("Ошибка", "Не удалось отредактировать книгу.")
-            except ValueError as e:
-                messagebox.showerror("Ошибка", f"Неверный год: {str(e)}")
+            
+            self._run_in_background(on_saved, self.system.edit_book, selected_book[0].get_id(),
+                                    title if title else None, year, bio if bio else None)
         
         ttk.Button(frame, text="Сохранить", command=save).pack(pady=10)
         ttk.Button(frame, text="Удалить", command=lambda: self._confirm_delete_book(selected_book)).pack(pady=5)
-    
+        return refresh
+
     def _confirm_delete_book(self, selected_book):
         """Подтверждает удаление книги."""
         if not selected_book[0]:
@@ -1400,38 +2271,54 @@ class LibraryApp:
             return
         
         if messagebox.askyesno("Подтверждение", f"Вы уверены, что хотите удалить '{selected_book[0].get_title()}'?"):
-            if self.system.remove_book(selected_book[0].get_id()):
-                messagebox.showinfo("Успех", "Книга удалена!")
-                self.show_list_books()
-            else:
-                messagebox.showerror("Ошибка", "Не удалось удалить книгу.")
+            def on_removed(removed):
+                if removed:
+                    messagebox.showinfo("Успех", "Книга удалена!")
+                    self.show_list_books()
+                else:
+                    messagebox.showerror("Ошибка", "Не удалось удалить книгу.")
+            
+            self._run_in_background(on_removed, self.system.remove_book, selected_book[0].get_id())
 
     def show_edit_user(self):
         """Показывает форму редактирования пользователя."""
-        self.clear_content()
-        ttk.Label(self.content_frame, text="Редактировать пользователя", style="Title.TLabel").pack(pady=10)
+        self._show_screen("edit_user", self._build_edit_user)
+
+    def _build_edit_user(self, parent):
+        """Создает форму редактирования пользователя.
         
-        frame = ttk.Frame(self.content_frame)
+        Returns:
+            callable: Обновляет список пользователей и очищает форму
+        """
+        ttk.Label(parent, text="Редактировать пользователя", style="Title.TLabel").pack(pady=10)
+        
+        frame = ttk.Frame(parent)
         frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         # Выбор пользователя
         ttk.Label(frame, text="Выберите пользователя:").pack(anchor="w", pady=(10, 0))
-        users = self.system.get_users()
-        user_options = [f"{u.get_name()} (ID: {u.get_id()})" for u in users]
-        user_combo = ttk.Combobox(frame, values=user_options, state="readonly", width=40)
+        user_combo = ttk.Combobox(frame, state="readonly", width=40)
         user_combo.pack(fill=tk.X, pady=5)
         
-        if not users:
-            ttk.Label(frame, text="Нет пользователей для редактирования!", foreground="red").pack(pady=20)
-            return
+        empty_label = ttk.Label(frame, text="", foreground="red")
+        empty_label.pack()
         
+        users = []
         selected_user = [None]
         
+        def refresh():
+            nonlocal users
+            users, user_options = self._cached_options("users", self._build_user_options)
+            user_combo.configure(values=user_options)
+            user_combo.set("")
+            empty_label.configure(text="" if users else "Нет пользователей для редактирования!")
+            selected_user[0] = None
+            name_entry.delete(0, tk.END)
+        
         def on_user_select(event=None):
-            if not user_combo.get():
+            if user_combo.current() < 0:
                 return
-            user_id = int(user_combo.get().split("ID: ")[1].rstrip(")"))
-            selected_user[0] = next((u for u in users if u.get_id() == user_id), None)
+            selected_user[0] = users[user_combo.current()]
             
             if selected_user[0]:
                 name_entry.delete(0, tk.END)
@@ -1454,15 +2341,19 @@ class LibraryApp:
                 messagebox.showerror("Ошибка", "Введите имя!")
                 return
             
-            if self.system.edit_user(selected_user[0].get_id(), name):
-                messagebox.showinfo("Успех", "Пользователь отредактирован!")
-                self.show_list_users()
-            else:
-                messagebox.showerror("Ошибка", "Не удалось отредактировать пользователя.")
+            def on_saved(saved):
+                if saved:
+                    messagebox.showinfo("Успех", "Пользователь отредактирован!")
+                    self.show_list_users()
+                else:
+                    messagebox.showerror("Ошибка", "Не удалось отредактировать пользователя.")
+            
+            self._run_in_background(on_saved, self.system.edit_user, selected_user[0].get_id(), name)
         
         ttk.Button(frame, text="Сохранить", command=save).pack(pady=10)
         ttk.Button(frame, text="Удалить", command=lambda: self._confirm_delete_user(selected_user)).pack(pady=5)
-    
+        return refresh
+
     def _confirm_delete_user(self, selected_user):
         """Подтверждает удаление пользователя."""
         if not selected_user[0]:
@@ -1470,14 +2361,20 @@ class LibraryApp:
             return
         
         if messagebox.askyesno("Подтверждение", f"Вы уверены, что хотите удалить '{selected_user[0].get_name()}'?"):
-            if self.system.delete_user(selected_user[0].get_id()):
-                messagebox.showinfo("Успех", "Пользователь удален!")
-                self.show_list_users()
-            else:
-                messagebox.showerror("Ошибка", "Не удалось удалить пользователя.")
+            def on_deleted(deleted):
+                if deleted:
+                    messagebox.showinfo("Успех", "Пользователь удален!")
+                    self.show_list_users()
+                else:
+                    messagebox.showerror("Ошибка", "Не удалось удалить пользователя.")
+            
+            self._run_in_background(on_deleted, self.system.delete_user, selected_user[0].get_id())
 
     def on_closing(self):
-        """Закрывает приложение."""
+        """Закрывает приложение (повторные вызовы игнорируются)."""
+        if self._closed:
+            return
+        self._closed = True
         self.system.close()
         self.root.destroy()
         logger.info("Приложение закрыто")
@@ -1486,5 +2383,4 @@ if __name__ == "__main__":
     root = tk.Tk()
     app = LibraryApp(root)
     root.protocol("WM_DELETE_WINDOW", app.on_closing)
-    root.mainloop()
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,2 @@
+# Модуль 1.py загружается один раз на всю сессию тестов до сбора тестовых файлов
+import library_loader  # noqa: F401
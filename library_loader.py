@@ -0,0 +1,12 @@
+import os
+import sys
+import importlib.util
+
+# Загружаем модуль 1.py один раз (имя файла начинается с цифры, поэтому используем importlib)
+# и регистрируем его в sys.modules как library_app; повторный импорт берет его из кэша
+MODULE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '1.py')
+if 'library_app' not in sys.modules:
+    spec = importlib.util.spec_from_file_location('library_app', MODULE_PATH)
+    library_app = importlib.util.module_from_spec(spec)
+    sys.modules['library_app'] = library_app
+    spec.loader.exec_module(library_app)
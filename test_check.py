@@ -5,50 +5,79 @@
 Проверяет основные функции без GUI.
 """
 
+import ast
+import importlib.util
 import sys
-from datetime import datetime, timedelta
+
+# Строки вывода копятся и печатаются одной записью в конце каждого раздела
+out = []
+
+
+def flush_output():
+    """Печатает накопленные строки одним вызовом и очищает буфер."""
+    if out:
+        sys.stdout.write('\n'.join(out) + '\n')
+        out.clear()
+
 
 # Попытаемся импортировать основные компоненты
 try:
-    print("[1] Проверка импортов...")
-    from datetime import datetime, timedelta
+    out.append("[1] Проверка импортов...")
     import sqlite3
     import logging
     from abc import ABC, abstractmethod
-    import tkinter as tk
-    print("    ✓ Все импорты успешны\n")
+    # tkinter только ищем, не загружая библиотеки Tcl/Tk
+    if importlib.util.find_spec('tkinter') is None:
+        raise ImportError("No module named 'tkinter'")
+    out.append("    ✓ Все импорты успешны\n")
 except ImportError as e:
-    print(f"    ✗ Ошибка импорта: {e}")
+    out.append(f"    ✗ Ошибка импорта: {e}")
+    flush_output()
     sys.exit(1)
 
-print("[2] Проверка структуры приложения...")
-print("    Проверяем наличие файлов...")
+flush_output()
+out.append("[2] Проверка структуры приложения...")
+out.append("    Проверяем наличие файлов...")
 import os
-from pathlib import Path
 
 required_files = ['1.py', 'README.md', 'INSTRUCTIONS.txt', 'IMPROVEMENTS.txt']
-missing = [f for f in required_files if not Path(f).exists()]
+# Один проход по каталогу вместо отдельного stat() на каждый файл
+with os.scandir('.') as entries:
+    present = {entry.name for entry in entries}
+missing = [f for f in required_files if f not in present]
 
 if missing:
-    print(f"    ✗ Отсутствуют файлы: {missing}")
+    out.append(f"    ✗ Отсутствуют файлы: {missing}")
 else:
-    print(f"    ✓ Все основные файлы присутствуют\n")
+    out.append(f"    ✓ Все основные файлы присутствуют\n")
 
-print("[3] Проверка основных компонентов кода...")
+flush_output()
+out.append("[3] Проверка основных компонентов кода...")
 
 # Проверим наличие классов в коде
 with open('1.py', 'r', encoding='utf-8') as f:
     code = f.read()
 
+# Разбираем исходник один раз и собираем имена классов и функций
+tree = ast.parse(code)
+class_names = set()
+function_names = set()
+for node in ast.walk(tree):
+    if isinstance(node, ast.ClassDef):
+        class_names.add(node.name)
+    elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        function_names.add(node.name)
+
 classes_to_check = ['Person', 'User', 'Librarian', 'Author', 'Book', 'Loan', 'LibrarySystem', 'LibraryApp']
 for cls in classes_to_check:
-    if f'class {cls}' in code:
-        print(f"    ✓ Класс {cls} присутствует")
+    if cls in class_names:
+        out.append(f"    ✓ Класс {cls} присутствует")
     else:
-        print(f"    ✗ Класс {cls} отсутствует")
+        out.append(f"    ✗ Класс {cls} отсутствует")
 
-print()
-print("[4] Проверка новых методов...")
+flush_output()
+out.append('')
+out.append("[4] Проверка новых методов...")
 
 methods_to_check = {
     'get_id': 'Метод получения ID',
@@ -61,13 +90,14 @@ methods_to_check = {
 }
 
 for method, desc in methods_to_check.items():
-    if method in code:
-        print(f"    ✓ {desc} ({method})")
+    if method in function_names:
+        out.append(f"    ✓ {desc} ({method})")
     else:
-        print(f"    ✗ {desc} ({method}) отсутствует")
+        out.append(f"    ✗ {desc} ({method}) отсутствует")
 
-print()
-print("[5] Проверка улучшений...")
+flush_output()
+out.append('')
+out.append("[5] Проверка улучшений...")
 
 improvements_to_check = {
     'UNIQUE': 'UNIQUE constraint',
@@ -79,73 +109,78 @@ improvements_to_check = {
     'try-except': 'Обработка ошибок',
 }
 
+# Проверяем В ЛЮБОМ РЕГИСТРЕ: копия в нижнем регистре создается один раз
+code_lower = code.lower()
 for feature, desc in improvements_to_check.items():
-    # Проверяем В ЛЮБОМ РЕГИСТРЕ
-    if feature.lower() in code.lower():
-        print(f"    ✓ {desc}")
+    if feature.lower() in code_lower:
+        out.append(f"    ✓ {desc}")
     else:
-        print(f"    ✗ {desc} не найден")
+        out.append(f"    ✗ {desc} не найден")
 
-print()
-print("[6] Проверка БД...")
+flush_output()
+out.append('')
+out.append("[6] Проверка БД...")
 
 if os.path.exists('library.db'):
-    print("    ✓ Файл БД существует")
+    out.append("    ✓ Файл БД существует")
     
     try:
         conn = sqlite3.connect('library.db')
         cursor = conn.cursor()
         
-        # Проверим таблицы
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        tables = [row[0] for row in cursor.fetchall()]
+        # Таблицы и индексы получаем одним запросом
+        cursor.execute("SELECT type, name FROM sqlite_master WHERE type IN ('table', 'index')")
+        tables, indexes = set(), set()
+        for obj_type, name in cursor.fetchall():
+            (tables if obj_type == 'table' else indexes).add(name)
         
         required_tables = ['authors', 'books', 'users', 'librarians', 'loans']
         for table in required_tables:
             if table in tables:
-                print(f"    ✓ Таблица {table} существует")
+                out.append(f"    ✓ Таблица {table} существует")
             else:
-                print(f"    ✗ Таблица {table} отсутствует")
+                out.append(f"    ✗ Таблица {table} отсутствует")
         
         # Проверим индексы
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='index'")
-        indexes = [row[0] for row in cursor.fetchall()]
-        
         if len(indexes) > 0:
-            print(f"    ✓ Найдено {len(indexes)} индексов")
+            out.append(f"    ✓ Найдено {len(indexes)} индексов")
         else:
-            print(f"    ⚠ Индексы не найдены")
+            out.append(f"    ⚠ Индексы не найдены")
         
         conn.close()
     except sqlite3.Error as e:
-        print(f"    ✗ Ошибка БД: {e}")
+        out.append(f"    ✗ Ошибка БД: {e}")
 else:
-    print("    ⚠ Файл БД не существует (будет создан при запуске)")
+    out.append("    ⚠ Файл БД не существует (будет создан при запуске)")
 
-print()
-print("[7] Проверка логирования...")
+flush_output()
+out.append('')
+out.append("[7] Проверка логирования...")
 
 if os.path.exists('library.log'):
-    print("    ✓ Файл логов существует")
-    with open('library.log', 'r', encoding='utf-8', errors='ignore') as f:
-        lines = f.readlines()
-    print(f"    ✓ В логе {len(lines)} строк")
+    out.append("    ✓ Файл логов существует")
+    # Считаем переводы строк блоками по 1 МБ, не создавая строку на каждую запись
+    with open('library.log', 'rb') as f:
+        line_count = sum(buf.count(b'\n') for buf in iter(lambda: f.read(1 << 20), b''))
+    out.append(f"    ✓ В логе {line_count} строк")
 else:
-    print("    ⚠ Файл логов не создан (будет создан при запуске)")
-
-print()
-print("=" * 50)
-print("ИТОГОВЫЙ РЕЗУЛЬТАТ ПРОВЕРКИ")
-print("=" * 50)
-print()
-print("Приложение готово к использованию!")
-print()
-print("Для запуска приложения используйте:")
-print("  python 1.py")
-print()
-print("Дополнительная информация в файлах:")
-print("  - README.md: Полная документация")
-print("  - INSTRUCTIONS.txt: Инструкции по использованию")
-print("  - IMPROVEMENTS.txt: Описание всех улучшений")
-print("  - SUMMARY.txt: Резюме проекта")
-print()
+    out.append("    ⚠ Файл логов не создан (будет создан при запуске)")
+
+flush_output()
+out.append('')
+out.append("=" * 50)
+out.append("ИТОГОВЫЙ РЕЗУЛЬТАТ ПРОВЕРКИ")
+out.append("=" * 50)
+out.append('')
+out.append("Приложение готово к использованию!")
+out.append('')
+out.append("Для запуска приложения используйте:")
+out.append("  python 1.py")
+out.append('')
+out.append("Дополнительная информация в файлах:")
+out.append("  - README.md: Полная документация")
+out.append("  - INSTRUCTIONS.txt: Инструкции по использованию")
+out.append("  - IMPROVEMENTS.txt: Описание всех улучшений")
+out.append("  - SUMMARY.txt: Резюме проекта")
+out.append('')
+flush_output()
@@ -2,69 +2,76 @@ import os
 import tempfile
 import unittest
 import sqlite3
-import importlib.util
 from datetime import datetime, timedelta
 
-# Загружаем модуль 1.py динамически (имя файла начинается с цифры, поэтому используем importlib)
-MODULE_PATH = os.path.join(os.path.dirname(__file__), '1.py')
-spec = importlib.util.spec_from_file_location('library_app', MODULE_PATH)
-library_app = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(library_app)
+# Модуль 1.py загружается один раз в library_loader и доступен как library_app
+import library_loader  # noqa: F401
+from library_app import LibrarySystem, Librarian, User, Author, Book, Loan
 
-LibrarySystem = library_app.LibrarySystem
-User = library_app.User
-Author = library_app.Author
-Book = library_app.Book
-Loan = library_app.Loan
+
+def _make_template():
+    """Создает пустую БД со схемой для копирования в тесты."""
+    system = LibrarySystem(db_name=':memory:', seed=False)
+    conn = sqlite3.connect(':memory:', check_same_thread=False)
+    system._conn.backup(conn)
+    system.close()
+    return conn
 
 class TestLibrarySystem(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Одно соединение со схемой на весь класс: тесты получают его копию через backup()
+        cls.template = _make_template()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.template.close()
+
     def setUp(self):
-        # Создаем временную БД
-        fd, path = tempfile.mkstemp(prefix='test_lib_', suffix='.db')
-        os.close(fd)
-        self.db_path = path
-        self.system = LibrarySystem(db_name=self.db_path)
-        # Очищаем демо-данные для контролируемого состояния
-        cur = self.system._conn.cursor()
-        cur.execute('DELETE FROM loans')
-        cur.execute('DELETE FROM books')
-        cur.execute('DELETE FROM authors')
-        cur.execute('DELETE FROM users')
-        cur.execute('DELETE FROM librarians')
-        self.system._conn.commit()
-        # Обновляем списки в памяти
-        self.system._books = []
-        self.system._users = []
-        self.system._authors = []
-        self.system._loans = []
-        self.system._librarians = []
+        # БД в памяти без демо-данных: каждый тест начинает с пустых таблиц
+        self.system = LibrarySystem(db_name=':memory:', seed=False, template=self.template)
+        # Один курсор на тест для прямых проверок содержимого БД
+        self.cur = self.system._conn.cursor()
 
     def tearDown(self):
-        try:
-            self.system.close()
-        except Exception:
-            pass
-        if os.path.exists(self.db_path):
-            os.remove(self.db_path)
+        self.system.close()
+
+    def scalar(self, sql, params=()):
+        """Возвращает первое значение первой строки запроса (None, если строк нет)."""
+        row = self.cur.execute(sql, params).fetchone()
+        return None if row is None else row[0]
 
     # ---------- Пользователи ----------
     def test_register_edit_delete_user(self):
         # register_user
         user = self.system.register_user('Test User')
         self.assertIsNotNone(user)
-        self.assertIn(user.get_id(), [u.get_id() for u in self.system.get_users()])
+        self.assertIs(self.system.find_user_by_id(user.get_id()), user)
 
         # edit_user
         ok = self.system.edit_user(user.get_id(), 'New Name')
         self.assertTrue(ok)
-        u = next((x for x in self.system.get_users() if x.get_id() == user.get_id()), None)
+        u = self.system.find_user_by_id(user.get_id())
         self.assertIsNotNone(u)
         self.assertEqual(u.get_name(), 'New Name')
+        # ключ поиска обновляется вместе с именем
+        self.assertEqual([x.get_id() for x in self.system.find_user_by_name('NE')], [user.get_id()])
 
         # delete_user
         ok = self.system.delete_user(user.get_id())
         self.assertTrue(ok)
-        self.assertIsNone(next((x for x in self.system.get_users() if x.get_id() == user.get_id()), None))
+        self.assertIsNone(self.system.find_user_by_id(user.get_id()))
+
+    # ---------- Библиотекари ----------
+    def test_register_librarian_upserts(self):
+        self.system.register_librarian(Librarian('Admin', 7, 1))
+        self.system.register_librarian(Librarian('Admin Renamed', 7, 2))
+        librarians = self.system.get_librarians()
+        self.assertEqual(len(librarians), 1)
+        self.assertEqual(librarians[0].get_name(), 'Admin Renamed')
+        self.assertEqual(librarians[0].get_access_level(), 2)
+        stored = self.system.authenticate_librarian(7)
+        self.assertEqual((stored.get_name(), stored.get_access_level()), ('Admin Renamed', 2))
 
     # ---------- Книги ----------
     def test_add_remove_edit_find_book(self):
@@ -78,11 +85,8 @@ class TestLibrarySystem(unittest.TestCase):
         self.assertTrue(added)
 
         # Найдем книгу в БД
-        cur = self.system._conn.cursor()
-        cur.execute('SELECT id FROM books WHERE title=?', (title,))
-        row = cur.fetchone()
-        self.assertIsNotNone(row)
-        book_id = row[0]
+        book_id = self.scalar('SELECT id FROM books WHERE title=?', (title,))
+        self.assertIsNotNone(book_id)
 
         # find_book_by_title (подстрока)
         found = self.system.find_book_by_title('Unique')
@@ -94,17 +98,75 @@ class TestLibrarySystem(unittest.TestCase):
         ok = self.system.edit_book(book_id, title=new_title, year=new_year, author_bio='New bio')
         self.assertTrue(ok)
         # reload book
-        cur.execute('SELECT title, year FROM books WHERE id=?', (book_id,))
-        r = cur.fetchone()
+        r = self.cur.execute('SELECT title, year FROM books WHERE id=?', (book_id,)).fetchone()
         self.assertIsNotNone(r)
-        self.assertEqual(r[0], new_title)
-        self.assertEqual(r[1], new_year)
+        # соединение системы возвращает sqlite3.Row, поэтому столбцы читаются по имени
+        self.assertEqual((r['title'], r['year']), (new_title, new_year))
+        # объект в памяти обновлен без перезагрузки
+        book = next(b for b in self.system.get_books() if b.get_id() == book_id)
+        self.assertEqual(book.get_title(), new_title)
+        self.assertEqual(book.get_year(), new_year)
+        self.assertEqual(book.get_author().get_bio(), 'New bio')
+        self.assertEqual(book.get_author().get_short_bio(), 'New bio')
+        self.system.edit_book(book_id, author_bio='x' * 40)
+        self.assertEqual(book.get_author().get_short_bio(), 'x' * 30 + '...')
 
         # remove_book
         ok = self.system.remove_book(book_id)
         self.assertTrue(ok)
-        cur.execute('SELECT id FROM books WHERE id=?', (book_id,))
-        self.assertIsNone(cur.fetchone())
+        self.assertIsNone(self.scalar('SELECT id FROM books WHERE id=?', (book_id,)))
+        self.assertFalse(any(b.get_id() == book_id for b in self.system.get_books()))
+
+    # ---------- Получение по ID (identity map) ----------
+    def test_get_by_id_reuses_objects(self):
+        self.system.add_book('Mapped', 'Map Author', 'bio', 2001)
+        book = self.system.get_books()[0]
+        self.assertIs(self.system.find_book_by_id(book.get_id()), book)
+        self.assertIs(self.system._get_author_by_id(book.get_author().get_id()), book.get_author())
+
+        # промах: строка добавлена в БД в обход системы, объект читается один раз и затем переиспользуется
+        self.cur.execute('INSERT INTO books (title, author_id, year, status) VALUES (?, ?, ?, ?)',
+                         ('Direct', book.get_author().get_id(), 2002, 'доступна'))
+        self.cur.execute("INSERT INTO users (name) VALUES ('Direct User')")
+        self.system._conn.commit()
+        book_id = self.scalar('SELECT id FROM books WHERE title=?', ('Direct',))
+        user_id = self.scalar('SELECT id FROM users WHERE name=?', ('Direct User',))
+        loaded = self.system.find_book_by_id(book_id)
+        self.assertEqual(loaded.get_title(), 'Direct')
+        self.assertIs(loaded.get_author(), book.get_author())
+        self.assertIs(self.system.find_book_by_id(book_id), loaded)
+        self.assertEqual([b.get_id() for b in self.system.get_books()], [book.get_id(), book_id])
+        self.assertIn(loaded, self.system.get_available_books())
+        user = self.system.find_user_by_id(user_id)
+        self.assertEqual(user.get_name(), 'Direct User')
+        self.assertEqual([u.get_id() for u in self.system.get_users()], [user_id])
+        self.assertIsNone(self.system.find_user_by_id(10 ** 6))
+
+    # ---------- Поиск по подстроке ----------
+    def test_find_by_substring(self):
+        self.system.add_book('Война и мир', 'Лев Толстой', 'bio', 1869)
+        self.system.add_book('Мир "в кавычках"', 'Другой Автор', 'bio', 1900)
+        user = self.system.register_user('Мария Петрова')
+
+        # регистр не важен, в том числе для кириллицы
+        self.assertEqual(len(self.system.find_book_by_title('МИР')), 2)
+        self.assertEqual([b.get_title() for b in self.system.find_book_by_title('ойна')], ['Война и мир'])
+        self.assertEqual(len(self.system.find_book_by_title('"в кав')), 1)
+        # короткий запрос ищется в памяти
+        self.assertEqual(len(self.system.find_book_by_title('и')), 2)
+        # ограничение числа результатов для обоих путей поиска
+        self.assertEqual([b.get_title() for b in self.system.find_book_by_title('МИР', limit=1)], ['Война и мир'])
+        self.assertEqual(len(self.system.find_book_by_title('и', limit=1)), 1)
+        self.assertEqual([u.get_id() for u in self.system.find_user_by_name('петров')], [user.get_id()])
+        self.assertEqual([a.get_name() for a in self.system.find_author_by_name('толст')], ['Лев Толстой'])
+
+        # индекс следует за изменениями таблицы
+        book_id = self.system.find_book_by_title('Война')[0].get_id()
+        self.system.edit_book(book_id, title='Анна Каренина')
+        self.assertEqual(self.system.find_book_by_title('Война'), [])
+        self.assertEqual(len(self.system.find_book_by_title('Каренина')), 1)
+        self.system.remove_book(book_id)
+        self.assertEqual(self.system.find_book_by_title('Каренина'), [])
 
     # ---------- Выдача и возврат ----------
     def test_issue_and_return_book(self):
@@ -114,48 +176,108 @@ class TestLibrarySystem(unittest.TestCase):
         # создаем книгу
         title = 'Borrowable'
         self.system.add_book(title, 'Some Author', 'bio', 1999)
-        cur = self.system._conn.cursor()
-        cur.execute('SELECT id FROM books WHERE title=?', (title,))
-        book_row = cur.fetchone()
-        self.assertIsNotNone(book_row)
-        book_id = book_row[0]
+        self.system.add_book('Borrowable Later', 'Some Author', 'bio', 2000)
+        book_id = self.scalar('SELECT id FROM books WHERE title=?', (title,))
+        self.assertIsNotNone(book_id)
 
         # issue_book
+        version = self.system.get_version()
         loan = self.system.issue_book(user.get_id(), book_id)
         self.assertIsNotNone(loan)
+        self.assertGreater(self.system.get_version(), version)
+        self.assertNotIn(book_id, [b.get_id() for b in self.system.get_available_books()])
+        self.assertEqual([l.get_id() for l in self.system.get_active_loans()], [loan.get_id()])
+        # неудачная выдача данные не меняет
+        version = self.system.get_version()
+        self.assertIsNone(self.system.issue_book(user.get_id(), book_id))
+        self.assertEqual(self.system.get_version(), version)
         # book status should be 'выдана'
-        cur.execute('SELECT status FROM books WHERE id=?', (book_id,))
-        status = cur.fetchone()[0]
-        self.assertEqual(status, 'выдана')
+        self.assertEqual(self.scalar('SELECT status FROM books WHERE id=?', (book_id,)), 'выдана')
 
         # return_book
         ok = self.system.return_book(loan.get_id())
         self.assertTrue(ok)
-        cur.execute('SELECT status FROM books WHERE id=?', (book_id,))
-        status2 = cur.fetchone()[0]
-        self.assertEqual(status2, 'доступна')
+        self.assertEqual(self.scalar('SELECT status FROM books WHERE id=?', (book_id,)), 'доступна')
+        # возвращенная книга снова в списке доступных, порядок каталога сохранен
+        self.assertEqual(self.system.get_available_books(), self.system.get_books())
+        self.assertEqual(self.system.get_active_loans(), [])
 
-    # ---------- User.borrow_book и return_book (локально) ----------
-    def test_user_borrow_return_methods(self):
-        u = User('Local', 123)
-        a = Author(1, 'A')
-        b = Book(1, 'B', a, 2001)
-        self.assertTrue(u.borrow_book(b))
-        self.assertIn(b, u.get_borrowed_books())
-        self.assertTrue(u.return_book(b))
-        self.assertNotIn(b, u.get_borrowed_books())
+    # ---------- Фоновый поток БД ----------
+    def test_submit_runs_in_worker(self):
+        future = self.system.submit(self.system.register_user, 'Async User')
+        user = future.result(timeout=5)
+        self.assertIsNotNone(user)
+        self.assertIs(self.system.find_user_by_id(user.get_id()), user)
 
-    # ---------- Loan.is_overdue ----------
-    def test_loan_is_overdue(self):
-        a = Author(1, 'A')
-        b = Book(1, 'B', a, 2001)
-        u = User('U', 1)
-        old_date = datetime.now() - timedelta(days=20)
-        loan = Loan(1, b, u, old_date)
-        self.assertTrue(loan.is_overdue())
-        # если вернуть — не просрочено
-        loan.return_book(datetime.now())
-        self.assertFalse(loan.is_overdue())
+        # исключение операции передается через Future
+        failing = self.system.submit(self.system.edit_book, 1, None, -5)
+        with self.assertRaises(ValueError):
+            failing.result(timeout=5)
+
+    def test_search_while_worker_writes(self):
+        # поиск из основного потока идет через ту же очередь, что и записи в фоновом потоке
+        futures = []
+        for i in range(50):
+            futures.append(self.system.submit(self.system.register_user, f'Читатель {i}'))
+            found = self.system.find_user_by_name('Читатель')
+            self.assertEqual(len(found), i + 1)
+            self.assertTrue(all('Читатель' in u.get_name() for u in found))
+        users = [f.result(timeout=5) for f in futures]
+        self.assertNotIn(None, users)
+        ids = [u.get_id() for u in self.system.get_users()]
+        self.assertEqual(len(ids), len(set(ids)))
+
+    # ---------- Отчет по просрочкам ----------
+    def test_overdue_counts_by_user(self):
+        u1 = self.system.register_user('U1')
+        u2 = self.system.register_user('U2')
+        book_ids = []
+        for i in range(4):
+            self.system.add_book(f'Overdue {i}', 'Author O', 'bio', 2001)
+            book_ids.append(self.scalar('SELECT id FROM books WHERE title=?', (f'Overdue {i}',)))
+        loans = [self.system.issue_book(u1.get_id(), book_ids[0]),
+                 self.system.issue_book(u1.get_id(), book_ids[1]),
+                 self.system.issue_book(u2.get_id(), book_ids[2]),
+                 self.system.issue_book(u2.get_id(), book_ids[3])]
+        self.assertNotIn(None, loans)
+        # выдачи еще не загружены в память: сдвигаем даты в БД, и они будут прочитаны при первом обращении
+        old_ids = [loans[0].get_id(), loans[1].get_id(), loans[3].get_id()]
+        self.cur.execute('UPDATE loans SET issue_ts = issue_ts - ? WHERE id IN (?, ?, ?)',
+                         (20 * 24 * 3600, *old_ids))
+        self.system._conn.commit()
+        # просроченная, но возвращенная выдача в отчет не попадает
+        self.assertTrue(self.system.return_book(loans[3].get_id()))
+        self.assertEqual(self.system.overdue_counts_by_user(), {u1.get_id(): 2})
+
+    # ---------- Миграция дат выдач ----------
+    def test_migrates_iso_loan_dates(self):
+        fd, path = tempfile.mkstemp(prefix='test_lib_old_', suffix='.db')
+        os.close(fd)
+        issued = datetime(2024, 5, 1, 12, 30, 15)
+        conn = sqlite3.connect(path)
+        conn.executescript('''
+            CREATE TABLE authors (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL UNIQUE, bio TEXT);
+            CREATE TABLE books (id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL,
+                                author_id INTEGER, year INTEGER, status TEXT);
+            CREATE TABLE users (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL);
+            CREATE TABLE loans (id INTEGER PRIMARY KEY AUTOINCREMENT, book_id INTEGER, user_id INTEGER,
+                                issue_date TEXT, return_date TEXT);
+            INSERT INTO authors (id, name, bio) VALUES (1, 'A', '');
+            INSERT INTO books (id, title, author_id, year, status) VALUES (1, 'Old', 1, 2000, 'выдана');
+            INSERT INTO users (id, name) VALUES (1, 'U');
+        ''')
+        conn.execute('INSERT INTO loans (book_id, user_id, issue_date) VALUES (1, 1, ?)', (issued.isoformat(),))
+        conn.commit()
+        conn.close()
+        try:
+            old_sys = LibrarySystem(db_name=path)
+            loans = old_sys.get_loans()
+            self.assertEqual(len(loans), 1)
+            self.assertEqual(loans[0].get_issue_date(), issued)
+            self.assertIsNone(loans[0].get_return_date())
+            old_sys.close()
+        finally:
+            os.remove(path)
 
     # ---------- Загрузка данных из БД (_load_*) ----------
     def test_load_functions(self):
@@ -165,22 +287,72 @@ class TestLibrarySystem(unittest.TestCase):
         self.system.add_book('LoadBook2', 'LB', 'bio2', 1992)
 
         # выдача
-        cur = self.system._conn.cursor()
-        cur.execute('SELECT id FROM books WHERE title=?', ('LoadBook1',))
-        b1 = cur.fetchone()[0]
+        b1 = self.scalar('SELECT id FROM books WHERE title=?', ('LoadBook1',))
         loan = self.system.issue_book(u1.get_id(), b1)
         self.assertIsNotNone(loan)
 
-        # создаем новый экземпляр системы чтобы проверить загрузку из БД
-        new_sys = LibrarySystem(db_name=self.db_path)
+        # копируем БД в файл и создаем новый экземпляр системы, чтобы проверить загрузку из БД
+        fd, path = tempfile.mkstemp(prefix='test_lib_', suffix='.db')
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        file_conn = sqlite3.connect(path)
+        self.system._conn.backup(file_conn)
+        file_conn.close()
+        new_sys = LibrarySystem(db_name=path)
+        # выдачи не читаются при старте, только при первом обращении
+        self.assertIsNone(new_sys._loans)
         # проверяем загрузку
         books = new_sys.get_books()
         users = new_sys.get_users()
+        statements = []
+        new_sys._conn.set_trace_callback(statements.append)
         loans = new_sys.get_loans()
+        new_sys._conn.set_trace_callback(None)
         self.assertTrue(any('LoadBook1' in bk.get_title() for bk in books))
         self.assertTrue(any(u.get_name() == 'L1' for u in users))
         self.assertTrue(any(isinstance(l, Loan) for l in loans))
+        # выдачи читаются одним запросом, книги и пользователи берутся из уже загруженных объектов
+        self.assertEqual(len(statements), 1)
+        self.assertIs(loans[0].get_book(), new_sys.find_book_by_id(b1))
+        self.assertIs(loans[0].get_user(), new_sys.find_user_by_id(u1.get_id()))
+        self.assertEqual(new_sys.get_overdue_loans(), [])
         new_sys.close()
 
+class TestModels(unittest.TestCase):
+    """Тесты объектов предметной области: БД для них не нужна, поэтому setUp нет."""
+
+    # ---------- User.borrow_book и return_book (локально) ----------
+    def test_user_borrow_return_methods(self):
+        u = User('Local', 123)
+        a = Author(1, 'A')
+        b = Book(1, 'B', a, 2001)
+        self.assertTrue(u.borrow_book(b))
+        self.assertTrue(u.has_borrowed(b))
+        # книги сравниваются по ID: другой объект той же книги тоже найден
+        self.assertEqual(Book(1, 'B', a, 2001), b)
+        self.assertTrue(u.has_borrowed(Book(1, 'B', a, 2001)))
+        self.assertTrue(u.return_book(b))
+        self.assertFalse(u.has_borrowed(b))
+        self.assertEqual(u.get_borrowed_books(), [])
+
+    # ---------- Loan.is_overdue ----------
+    def test_loan_is_overdue(self):
+        a = Author(1, 'A')
+        b = Book(1, 'B', a, 2001)
+        u = User('U', 1)
+        # текущий момент фиксируется один раз и передается в is_overdue явно
+        now = datetime.now()
+        old_date = now - timedelta(days=20)
+        loan = Loan(1, b, u, old_date)
+        self.assertTrue(loan.is_overdue(now))
+        # проверка относительно переданного момента времени
+        self.assertFalse(loan.is_overdue(old_date + timedelta(days=1)))
+        # даты для показа
+        self.assertEqual(loan.get_issue_date_str(), old_date.strftime('%d.%m.%Y'))
+        self.assertEqual(loan.get_due_date_str(), (old_date + timedelta(days=14)).strftime('%d.%m.%Y'))
+        # если вернуть — не просрочено
+        loan.return_book(now)
+        self.assertFalse(loan.is_overdue(now))
+
 if __name__ == '__main__':
     unittest.main()